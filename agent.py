@@ -0,0 +1,284 @@
+import random
+
+import pygame
+
+from atlas import get_frames
+from population import SCREEN_BOUNDS
+
+
+class Agent:
+    """
+    Slotted base for every agent state.
+
+    Instances carry only the attributes listed in __slots__, with no
+    per-agent __dict__. pygame's Sprite class has one, so this class
+    implements the small sprite protocol Groups rely on itself
+    (add_internal, remove_internal, groups, alive, kill); Groups accept
+    such sprites and draw them from image and rect as usual.
+
+    Every state runs the same update() pipeline. What differs between
+    states is given as class attributes (tint, speed range, turn chance
+    and spread, boundary rule, how the agent deflects), with a few hooks
+    (apply_state, advance_state, turn_probability, turn_range) for the
+    states whose behavior depends on their own attributes. All subclasses
+    share this layout and declare empty __slots__, so Simulation.transition
+    can switch an agent's class in place.
+    """
+
+    __slots__ = (
+        "_groups", "rng", "all_sprites", "neighbors",
+        "image", "rect", "image_list_down", "image_list_up", "image_list_left", "image_list_right",
+        "current_direction", "animation_index", "animation_counter", "direction_vector", "speed",
+        "emotional_valence", "skepticism", "influence", "misinfo_bonus", "persuasiveness",
+        "zone", "in_social", "next_switch_time", "home_grid_cell",
+        "current_zone", "stuck_counter",
+        "frame_set", "exposure_time", "conflict_level", "flash_counter",
+    )
+
+    state = None  # State code used by the transition kernels
+    color = (255, 255, 255)
+    speed_range = (2, 4)  # Inclusive range speed is drawn from
+    animation_speed = 5  # Ticks per animation frame
+    turn_chance = 0.02  # Per-tick chance of picking a new heading
+    turn_spread = 1.0  # New headings are drawn from [-spread, spread] per axis
+    center_bias = None  # Pull of new headings towards the zone centre, if any
+    boundary = "screen"  # "screen" reflects off the screen box, "zone" stays inside its zone
+    boundary_padding = 15  # Padding from zone edges for the "zone" rule
+    max_stuck_frames = 10  # Frames nearly still before the "zone" rule forces a turn
+    deflection = "away"  # "away" reflects off the other agent, "random" off a random normal
+    avoids_neighbors = True  # Deflect off the first overlapping agent every tick
+
+    def __init__(self, group, all_sprites, rng=random):
+        self._groups = set()
+        self.rng = rng  # Movement stream of the run (rng.Stream), or the random module
+        self.all_sprites = all_sprites
+        self.neighbors = None  # Simulation's per-tick SpatialHash of all agents, if any
+        self.emotional_valence = self.rng.uniform(0, 1)
+        self.influence = 1.0
+        self.zone = None  # Name of the zone the agent is filed under (see zoneindex.py)
+        self.in_social = False
+        self.next_switch_time = 0
+        self.home_grid_cell = None
+        self.current_zone = None
+        self.stuck_counter = 0
+
+        self.apply_state()
+
+        # Set initial image and rect
+        self.current_direction = "right"
+        self.animation_index = 0
+        self.image = self.image_list_right[self.animation_index]
+        self.rect = self.image.get_rect(center=(self.rng.randint(50, 900), self.rng.randint(50, 550)))
+
+        # Movement properties
+        self.direction_vector = pygame.math.Vector2(self.rng.choice([-1, 1]), self.rng.choice([-1, 1])).normalize()
+        self.animation_counter = 0
+        self.skepticism = self.rng.uniform(0.2, 0.8)  # Individual skepticism level
+
+    # --- Sprite protocol used by pygame.sprite.Group ---
+
+    def add_internal(self, group):
+        self._groups.add(group)
+
+    def remove_internal(self, group):
+        self._groups.remove(group)
+
+    def groups(self):
+        return list(self._groups)
+
+    def alive(self):
+        return bool(self._groups)
+
+    def kill(self):
+        for group in list(self._groups):
+            group.remove_internal(self)
+        self._groups.clear()
+
+    # --- State ---
+
+    def apply_state(self):
+        """Set this state's frames and speed (on spawn, and on every transition into it)."""
+        self.frame_set = 0
+        self.refresh_frames()
+        self.speed = self.rng.randint(*self.speed_range)
+
+    def refresh_frames(self):
+        """Point the animation frames at the shared atlas frames of the current frame set."""
+        # Animation frames come from the shared atlas, loaded once per color
+        self.use_frames(get_frames(self.color))
+
+    def use_frames(self, frames):
+        self.image_list_down = frames["down"]
+        self.image_list_up = frames["up"]
+        self.image_list_left = frames["left"]
+        self.image_list_right = frames["right"]
+
+    def advance_state(self):
+        """Per-tick state bookkeeping, run before the agent moves."""
+
+    def turn_probability(self):
+        return self.turn_chance
+
+    def turn_range(self):
+        return self.turn_spread
+
+    # --- Update pipeline ---
+
+    def update(self, zones=None):
+        self.advance_state()
+        self.handle_movement()
+        self.animate()
+        if self.boundary == "screen":
+            self.handle_boundaries()
+        elif zones:
+            self.handle_zone_boundaries(zones)
+            self.check_if_stuck()
+        if self.avoids_neighbors:
+            self.check_collisions()
+
+    def handle_movement(self):
+        self.rect.centerx += self.direction_vector.x * self.speed
+        self.rect.centery += self.direction_vector.y * self.speed
+
+        if self.rng.random() < self.turn_probability():
+            self.change_direction()
+
+    def animate(self):
+        self.animation_counter += 1
+        if self.animation_counter >= self.animation_speed:
+            self.animation_counter = 0
+            self.animation_index = (self.animation_index + 1) % 3
+            self.update_image()
+
+    def update_image(self):
+        # Select the correct image based on direction
+        if self.current_direction == "down":
+            self.image = self.image_list_down[self.animation_index]
+        elif self.current_direction == "up":
+            self.image = self.image_list_up[self.animation_index]
+        elif self.current_direction == "left":
+            self.image = self.image_list_left[self.animation_index]
+        else:  # right
+            self.image = self.image_list_right[self.animation_index]
+
+        # Update the rect to match the new image while maintaining position
+        old_center = self.rect.center
+        self.rect = self.image.get_rect()
+        self.rect.center = old_center
+
+    def handle_boundaries(self):
+        left, top, right, bottom = SCREEN_BOUNDS
+        if self.rect.left < left or self.rect.right > right:
+            self.direction_vector.x *= -1
+            self.update_direction_facing()
+        if self.rect.top < top or self.rect.bottom > bottom:
+            self.direction_vector.y *= -1
+            self.update_direction_facing()
+
+    def handle_zone_boundaries(self, zones):
+        # Current zone, from the zone the agent is filed under
+        self.current_zone = zones.get(self.zone) if self.zone is not None else None
+
+        if not self.current_zone:
+            return
+
+        # Calculate effective boundaries with padding
+        left_bound = self.current_zone.left + self.boundary_padding
+        right_bound = self.current_zone.right - self.boundary_padding
+        top_bound = self.current_zone.top + self.boundary_padding
+        bottom_bound = self.current_zone.bottom - self.boundary_padding
+
+        bounced = False
+        if self.rect.left < left_bound:
+            self.rect.left = left_bound
+            self.direction_vector.x = abs(self.direction_vector.x)  # Force rightward
+            bounced = True
+        elif self.rect.right > right_bound:
+            self.rect.right = right_bound
+            self.direction_vector.x = -abs(self.direction_vector.x)  # Force leftward
+            bounced = True
+
+        if self.rect.top < top_bound:
+            self.rect.top = top_bound
+            self.direction_vector.y = abs(self.direction_vector.y)  # Force downward
+            bounced = True
+        elif self.rect.bottom > bottom_bound:
+            self.rect.bottom = bottom_bound
+            self.direction_vector.y = -abs(self.direction_vector.y)  # Force upward
+            bounced = True
+
+        if bounced:
+            self.direction_vector = self.direction_vector.normalize()
+            self.update_direction_facing()
+            self.stuck_counter = 0
+
+    def check_if_stuck(self):
+        # Increment stuck counter if velocity is very low
+        if abs(self.direction_vector.x) < 0.1 and abs(self.direction_vector.y) < 0.1:
+            self.stuck_counter += 1
+        else:
+            self.stuck_counter = 0
+
+        # Force a direction change if stuck for too long
+        if self.stuck_counter > self.max_stuck_frames:
+            self.change_direction()
+            self.stuck_counter = 0
+
+    def check_collisions(self):
+        if self.neighbors is not None:
+            other = self.neighbors.first_overlap(self, ratio=0.8)
+            if other is not None:
+                self.handle_collision(other)
+            return
+        collisions = pygame.sprite.spritecollide(
+            self,
+            self.all_sprites,
+            False,
+            collided=pygame.sprite.collide_rect_ratio(0.8)
+        )
+        for other in collisions:
+            if other is not self:
+                self.handle_collision(other)
+                break
+
+    def handle_collision(self, other):
+        if self.deflection == "random":
+            normal = pygame.math.Vector2(self.rng.uniform(-0.5, 0.5), self.rng.uniform(-0.5, 0.5))
+            if normal.length() < 1e-3:  # pygame rejects normals shorter than this in reflect()
+                normal = pygame.math.Vector2(1, 0)
+        else:
+            # Defensive: avoid zero-length normal or direction_vector
+            normal = pygame.math.Vector2(self.rect.centerx - other.rect.centerx, self.rect.centery - other.rect.centery)
+            if normal.length_squared() == 0:
+                # Assign a random normal if overlap is perfect
+                normal = pygame.math.Vector2(self.rng.choice([-1, 1]), self.rng.choice([-1, 1]))
+            if self.direction_vector.length_squared() == 0:
+                self.direction_vector = pygame.math.Vector2(self.rng.choice([-1, 1]), self.rng.choice([-1, 1])).normalize()
+        self.direction_vector = self.direction_vector.reflect(normal).normalize()
+        self.update_direction_facing()
+
+    def change_direction(self):
+        spread = self.turn_range()
+        new_direction = pygame.math.Vector2(
+            self.rng.uniform(-spread, spread),
+            self.rng.uniform(-spread, spread)
+        )
+        if self.center_bias is not None and self.current_zone:
+            # Bias the new direction towards the centre of the current zone,
+            # unless the agent is already close to it
+            to_center = pygame.math.Vector2(self.current_zone.center) - pygame.math.Vector2(self.rect.center)
+            if to_center.length() >= 20:
+                new_direction += to_center.normalize() * self.center_bias
+
+        # Ensure we don't get a zero vector
+        if new_direction.length() == 0:
+            new_direction = pygame.math.Vector2(1, 0)
+
+        self.direction_vector = new_direction.normalize()
+        self.update_direction_facing()
+
+    def update_direction_facing(self):
+        if abs(self.direction_vector.x) > abs(self.direction_vector.y):
+            self.current_direction = "left" if self.direction_vector.x < 0 else "right"
+        else:
+            self.current_direction = "up" if self.direction_vector.y < 0 else "down"
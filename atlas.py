@@ -0,0 +1,79 @@
+import pygame
+
+SPRITE_SCALE = (40, 70)  # Same size for every agent and direction
+DIRECTIONS = ("down", "up", "left", "right")
+FRAME_COUNT = 3
+
+# Agent animation frames, loaded from Images/ and tinted on first use
+_base_frames = {}  # direction -> tuple of scaled, untinted frames
+_tinted_frames = {}  # color -> {direction: tuple of tinted frames}
+_flash_frames = {}  # (color, flash color) -> {direction: tuple of flashing frames}
+
+
+def tint_surface(surface, color):
+    """Apply color tint to a surface while preserving transparency"""
+    tint = pygame.Surface(surface.get_size())
+    tint.fill(color)
+    surface = surface.copy()
+    surface.blit(tint, (0, 0), special_flags=pygame.BLEND_MULT)
+    return surface
+
+
+def _load_base_frames():
+    for direction in DIRECTIONS:
+        _base_frames[direction] = tuple(
+            pygame.transform.scale(
+                pygame.image.load(f'Images/running_{direction}_{i}.png').convert_alpha(),
+                SPRITE_SCALE
+            ) for i in range(1, FRAME_COUNT + 1)
+        )
+
+
+def get_frames(color):
+    """
+    Return the animation frames for an agent tint as {direction: frames}.
+
+    The PNGs are loaded and scaled once per process and each tint is
+    applied once per color; every agent of that color shares the same
+    Surfaces, so treat them as read-only.
+    """
+    color = tuple(color)
+    frames = _tinted_frames.get(color)
+    if frames is None:
+        if not _base_frames:
+            _load_base_frames()
+        frames = {
+            direction: tuple(tint_surface(surface, color) for surface in _base_frames[direction])
+            for direction in DIRECTIONS
+        }
+        _tinted_frames[color] = frames
+    return frames
+
+
+def get_frame(color, direction, index):
+    """Return a single shared frame keyed by (color, direction, frame index)."""
+    return get_frames(color)[direction][index]
+
+
+def get_flash_frames(color, flash_color):
+    """
+    Return the flashing variant of get_frames(color) as {direction: frames}.
+
+    Each frame is the tinted frame multiplied by color + flash_color
+    (clamped to 255), built once per pair of colors and shared like the
+    plain frames.
+    """
+    key = (tuple(color), tuple(flash_color))
+    frames = _flash_frames.get(key)
+    if frames is None:
+        blend_color = tuple(min(255, c + f) for c, f in zip(*key))
+        frames = {}
+        for direction, surfaces in get_frames(color).items():
+            flashing = []
+            for surface in surfaces:
+                surface = surface.copy()
+                surface.fill(blend_color, special_flags=pygame.BLEND_MULT)
+                flashing.append(surface)
+            frames[direction] = tuple(flashing)
+        _flash_frames[key] = frames
+    return frames
@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Phases timed on their own, with the hour each one is entered at on day 2
+# (see time_phase)
+PHASE_STARTS = (
+    ("sleep", 0),
+    ("social", 7),
+    ("work", 8),
+    ("home", 16),
+)
+
+# Population split across the types the game's setup screen offers
+POPULATION_SPLIT = (
+    ("Susceptible", 0.80),
+    ("Doubter", 0.15),
+    ("Disinformant", 0.05),
+)
+
+
+def population_counts(size, emotional_valence=5):
+    """Split size agents across POPULATION_SPLIT, at least one of each type."""
+    counts = {name: max(1, round(size * share)) for name, share in POPULATION_SPLIT}
+    counts["Susceptible"] += size - sum(counts.values())
+    counts["Emotional Valence"] = emotional_valence
+    return counts
+
+
+def peak_rss_kb():
+    """Return this process's peak resident set size in KiB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if platform.system() == "Darwin" else peak
+
+
+def result(size, case, ticks, seconds, agents):
+    return {
+        "size": size,
+        "case": case,
+        "ticks": ticks,
+        "seconds": seconds,
+        "ticks_per_s": ticks / seconds if seconds else None,
+        "agent_ticks_per_s": ticks * agents / seconds if seconds else None,
+    }
+
+
+def phase_minutes():
+    """Return {phase: minutes it lasts from its PHASE_STARTS hour} under the default schedule."""
+    from schedule import DailySchedule, compile_timetable
+
+    timetable = compile_timetable(DailySchedule())
+    return {phase: timetable[start_hour * 60].phase_left for phase, start_hour in PHASE_STARTS}
+
+
+def time_phase(sim, phase, start_hour, ticks, warmup):
+    """Put sim's clock just before start_hour on day 2 and time ticks steps of that phase."""
+    from schedule import MINUTES_PER_DAY
+
+    day = MINUTES_PER_DAY  # Midnight of day 2 on the simulation clock
+    sim.minute = day + start_hour * 60 - 1
+    sim.end_minute = day + 2 * MINUTES_PER_DAY
+    sim.running = True
+    sim.schedule_events()
+    # Sleep is timed minute by minute; fast-forward would make it one step
+    sim.fast_forward = False
+    for _ in range(warmup):
+        sim.step()
+    started = time.perf_counter()
+    for _ in range(ticks):
+        sim.step()
+    seconds = time.perf_counter() - started
+    assert sim.phase == phase, (sim.phase, phase)
+    return seconds
+
+
+def time_population(population, zones, ticks, warmup):
+    """Time ticks batched movement steps of a population.Population."""
+    for _ in range(warmup):
+        population.tick(zones)
+    started = time.perf_counter()
+    for _ in range(ticks):
+        population.tick(zones)
+    return time.perf_counter() - started
+
+
+def bench_size(size, ticks=30, warmup=5, seed=0, population=False):
+    """
+    Run every benchmark case for one population size; meant for a fresh process.
+    With population, also time the array store's movement in each waking phase.
+    """
+    from simulation import Simulation, change_probability, change_probability_batch
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        sim = Simulation(log_path=os.path.join(tmp, "log.csv"), seed=seed)
+        sim.start(population_counts(size))
+        agents = len(sim.all_sprites)
+
+        for phase, start_hour in PHASE_STARTS:
+            seconds = time_phase(sim, phase, start_hour, ticks, warmup)
+            rows.append(result(size, f"step:{phase}", ticks, seconds, agents))
+
+        # Contact rules, forgetting and logging alone, on the home-hours state left above
+        started = time.perf_counter()
+        for _ in range(ticks):
+            sim.custom_collision_checks()
+        rows.append(result(size, "custom_collision_checks", ticks,
+                           time.perf_counter() - started, agents))
+
+        # The transition probability, once per agent, scalar and batched
+        members = list(sim.all_sprites)
+        influencer = next(iter(sim.disinformant_group))
+        started = time.perf_counter()
+        for _ in range(ticks):
+            for agent in members:
+                change_probability(agent, influencer=influencer, environment_factor=0.7)
+        rows.append(result(size, "change_probability", ticks, time.perf_counter() - started, agents))
+
+        valence = np.array([a.emotional_valence for a in members])
+        skepticism = np.array([getattr(a, "skepticism", 0.5) for a in members])
+        state = np.array([a.state for a in members])
+        started = time.perf_counter()
+        for _ in range(ticks):
+            change_probability_batch(valence, skepticism, influencer.influence, 0.7, 0,
+                                     state, influencer.state)
+        rows.append(result(size, "change_probability_batch", ticks,
+                           time.perf_counter() - started, agents))
+
+        if population:
+            from population import Population
+
+            store = Population.from_counts(population_counts(size), sim.zones["home"],
+                                           rng=np.random.default_rng(seed))
+            zones = list(sim.zones.values())
+            for phase, _ in PHASE_STARTS:
+                if phase == "sleep":  # Nobody moves
+                    continue
+                # Sprites are only clamped to their zones in work hours
+                seconds = time_population(store, zones if phase == "work" else None, ticks, warmup)
+                rows.append(result(size, f"population:{phase}", ticks, seconds, store.size))
+        sim.close()
+
+    rss = peak_rss_kb()
+    for row in rows:
+        row["peak_rss_kb"] = rss
+    return rows
+
+
+def environment():
+    """Describe the machine and code version the numbers come from."""
+    import pygame
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "machine": platform.platform(),
+    }
+
+
+def run_benchmarks(sizes, ticks=30, warmup=5, seed=0, population=False):
+    """
+    Benchmark each population size in its own process, so peak RSS is per
+    size, and return the result rows tagged with the environment.
+    """
+    env = environment()
+    rows = []
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            size_rows = pool.submit(bench_size, size, ticks, warmup, seed, population).result()
+        for row in size_rows:
+            row.update(env)
+            row["seed"] = seed
+            rows.append(row)
+            print(f"{size:>6} {row['case']:<26} {row['ticks_per_s']:>12.1f} ticks/s"
+                  f" {row['agent_ticks_per_s']:>14.0f} agent-ticks/s")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time headless, seeded runs across population sizes and day phases.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[30, 300, 3000])
+    parser.add_argument('--ticks', type=int, default=30,
+                        help="Simulated minutes timed per case; with --warmup, at most the shortest phase (60)")
+    parser.add_argument('--warmup', type=int, default=5, help="Untimed minutes before each phase")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--population', action='store_true',
+                        help="Also time the NumPy array store (population.Population)")
+    parser.add_argument('--out', default='benchmark_results.jsonl',
+                        help="JSON Lines file the result rows are appended to")
+    args = parser.parse_args(argv)
+    # Every timed minute has to fall inside the phase it is reported under
+    for phase, minutes in phase_minutes().items():
+        if args.warmup + args.ticks > minutes:
+            parser.error(f"--warmup + --ticks is {args.warmup + args.ticks}, but the {phase} phase "
+                         f"only lasts {minutes} minutes")
+
+    rows = run_benchmarks(args.sizes, args.ticks, args.warmup, args.seed, args.population)
+    with open(args.out, 'a') as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+import gzip
+import json
+import os
+
+import numpy as np
+import pygame
+
+from agent import Agent
+
+CHECKPOINT_VERSION = 4
+
+# Agent attributes that are rebuilt on restore instead of saved: sprite
+# group bookkeeping, the shared group, RNG and neighbor index, and the Surfaces
+# (the frames follow from the state and its saved frame_set)
+SKIPPED_AGENT_ATTRIBUTES = {"_groups", "all_sprites", "rng", "neighbors", "image"}
+
+# Counter attribute of every state group, saved and restored as is
+COUNT_ATTRIBUTES = (
+    "susceptible_count",
+    "exposed_count",
+    "believer_count",
+    "doubter_count",
+    "recovered_count",
+    "disinformant_count",
+)
+
+
+def encode_value(value):
+    """Turn an agent attribute into JSON data, tagging the types JSON lacks."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pygame.Rect):
+        return {"rect": [value.x, value.y, value.width, value.height]}
+    if isinstance(value, pygame.math.Vector2):
+        return {"vector": [value.x, value.y]}
+    if isinstance(value, tuple):
+        return {"tuple": [encode_value(item) for item in value]}
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    raise TypeError(f"Cannot checkpoint a {type(value).__name__}")
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        (kind, data), = value.items()
+        if kind == "rect":
+            return pygame.Rect(*data)
+        if kind == "vector":
+            return pygame.math.Vector2(data)
+        if kind == "tuple":
+            return tuple(decode_value(item) for item in data)
+        raise ValueError(f"Unknown checkpoint value {kind!r}")
+    return value
+
+
+def agent_state(agent):
+    """Return an agent's set slots as JSON data, leaving out the rebuilt ones."""
+    return {
+        key: encode_value(getattr(agent, key)) for key in Agent.__slots__
+        if key not in SKIPPED_AGENT_ATTRIBUTES and not key.startswith("image_list_") and hasattr(agent, key)
+    }
+
+
+def snapshot(sim):
+    """
+    Return the state of a Simulation (or Game) as JSON-compatible data.
+
+    Agents are numbered by their position in all_sprites; every group,
+    home cell and queued zone switch refers to them by that number, in
+    its own order, so iteration order (and with it the run) carries over.
+    Surfaces, fonts and profiling data are left out.
+    """
+    agents = list(sim.all_sprites)
+    index = {agent: i for i, agent in enumerate(agents)}
+    return {
+        "version": CHECKPOINT_VERSION,
+        "settings": {
+            "seed": sim.seed,
+            "run_id": sim.run_id,
+            "log_path": sim.log_path,
+            "log_format": sim.log_format,
+            "home_grid_rows": sim.home_grid_rows,
+            "home_grid_cols": sim.home_grid_cols,
+            "home_cell_capacity": sim.home_cell_capacity,
+        },
+        "clock": {
+            "minute": sim.minute,
+            "end_minute": sim.end_minute,
+            "running": sim.running,
+            "phase": sim.phase,
+            "log_due": sim.log_due,
+            "fast_forward": sim.fast_forward,
+        },
+        "globals": {
+            "global_emotional_valence": sim.global_emotional_valence,
+            "total_misinformed": sim.total_misinformed,
+            "home_grid_capacity": sim.home_grid.capacity,
+        },
+        "counts": {name: getattr(sim, name) for name in COUNT_ATTRIBUTES},
+        "agents": [{"state": agent.state, "attributes": agent_state(agent)} for agent in agents],
+        "groups": {
+            "collision_group": [index[agent] for agent in sim.collision_group],
+            "states": {
+                str(state): [index[agent] for agent in group]
+                for state, (_, group, _) in sim.state_table.items()
+            },
+            "zones": {
+                name: [index[agent] for agent in members]
+                for name, members in sim.zone_members.items()
+            },
+        },
+        "home_grid": [
+            [list(cell), [index[agent] for agent in occupants]]
+            for cell, occupants in sim.home_grid.occupants.items() if occupants
+        ],
+        "events": {
+            "counter": sim.events.counter,
+            "heap": [[key, counter, kind, payload]
+                     for key, counter, (kind, payload) in sim.events.heap],
+        },
+        "switch_events": {
+            "counter": sim.switch_events.counter,
+            "heap": [[key, counter, index[agent]] for key, counter, agent in sim.switch_events.heap],
+        },
+        "rng": sim.rng.get_state(),
+        "log_rows": sim.logger.logged_rows() if sim.logger is not None else [],
+    }
+
+
+def restore(sim, state):
+    """Load a snapshot() into a freshly constructed Simulation that has not been started."""
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')!r}")
+
+    # Agents, rebuilt through their classes so frames and images come from the atlas
+    agents = []
+    for entry in state["agents"]:
+        agent_class, _, _ = sim.state_table[entry["state"]]
+        agent = agent_class(None, sim.all_sprites, rng=sim.rng.movement)
+        agent.neighbors = sim.neighbors
+        for key, value in entry["attributes"].items():
+            setattr(agent, key, decode_value(value))
+        agent.refresh_frames()
+        agent.update_image()
+        agents.append(agent)
+
+    sim.all_sprites.add(*agents)
+    sim.collision_group.add(*(agents[i] for i in state["groups"]["collision_group"]))
+    for code, members in state["groups"]["states"].items():
+        _, group, _ = sim.state_table[int(code)]
+        group.add(*(agents[i] for i in members))
+    for name, members in state["groups"]["zones"].items():
+        # Agents already carry their saved zone; refill the members in order
+        sim.zone_members[name].update((agents[i], None) for i in members)
+    for name, count in state["counts"].items():
+        setattr(sim, name, count)
+
+    sim.global_emotional_valence = state["globals"]["global_emotional_valence"]
+    sim.total_misinformed = state["globals"]["total_misinformed"]
+    for cell, members in state["home_grid"]:
+        sim.home_grid.occupants[tuple(cell)].extend(agents[i] for i in members)
+    sim.home_grid.set_capacity(state["globals"]["home_grid_capacity"])
+
+    clock = state["clock"]
+    sim.minute = clock["minute"]
+    sim.end_minute = clock["end_minute"]
+    sim.schedule_row = sim.timetable[sim.minute % len(sim.timetable)]
+    sim.running = clock["running"]
+    sim.phase = clock["phase"]
+    sim.log_due = clock["log_due"]
+    sim.fast_forward = clock["fast_forward"]
+
+    # Queued events as saved, except checkpoints, which follow this run's settings
+    sim.events.clear()
+    sim.events.heap = [
+        (key, counter, (kind, payload))
+        for key, counter, kind, payload in state["events"]["heap"] if kind != "checkpoint"
+    ]
+    sim.events.heap.sort()
+    sim.events.counter = state["events"]["counter"]
+    sim.schedule_checkpoint()
+    sim.switch_events.clear()
+    sim.switch_events.heap = [
+        (key, counter, agents[i]) for key, counter, i in state["switch_events"]["heap"]
+    ]
+    sim.switch_events.counter = state["switch_events"]["counter"]
+
+    # Rewrite the rows logged before the checkpoint, then carry on logging
+    sim.setup_logging()
+    for row in state["log_rows"]:
+        sim.logger.log(row)
+
+    sim.rng.set_state(state["rng"])
+    return sim
+
+
+def save_checkpoint(sim, path):
+    """
+    Write sim's state to path as gzipped JSON.
+
+    The file is written next to path first and moved into place, so an
+    interrupted save never leaves a truncated checkpoint behind.
+    """
+    temporary = path + ".tmp"
+    with gzip.open(temporary, "wt", encoding="utf-8") as f:
+        json.dump(snapshot(sim), f, separators=(",", ":"))
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path, **overrides):
+    """
+    Rebuild a headless Simulation from a checkpoint file, ready for step()
+    or resume().
+
+    Keyword arguments override the saved Simulation settings or add new
+    ones, e.g. log_path to branch a run into a new log, or
+    checkpoint_path/checkpoint_every to keep checkpointing. A custom
+    schedule is not saved; pass the same schedule again to resume on it.
+    """
+    from simulation import Simulation
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        state = json.load(f)
+    settings = dict(state["settings"], **overrides)
+    return restore(Simulation(**settings), state)
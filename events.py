@@ -0,0 +1,38 @@
+import heapq
+
+
+class EventQueue:
+    """
+    Min-heap of timed events.
+
+    Keys can be anything that orders (clock minutes, minutes of the day...);
+    events with equal keys come out in the order they were pushed.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def clear(self):
+        self.heap.clear()
+        self.counter = 0
+
+    def push(self, key, event):
+        heapq.heappush(self.heap, (key, self.counter, event))
+        self.counter += 1
+
+    def peek_key(self):
+        """Return the key of the next event, or None if the queue is empty."""
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, key):
+        """Remove and return every (key, event) with a key <= key, earliest first."""
+        heap = self.heap
+        due = []
+        while heap and heap[0][0] <= key:
+            event_key, _, event = heapq.heappop(heap)
+            due.append((event_key, event))
+        return due
@@ -0,0 +1,86 @@
+import pygame
+
+
+class HomeGrid:
+    """
+    Occupancy index for the cells of the home zone.
+
+    The cell rects are built once. occupants maps every cell to the agents
+    in it and free holds the cells that still have room, so assigning or
+    releasing an agent is O(1) and a cohort coming home is placed in one
+    pass instead of one full rescan per agent.
+    """
+
+    def __init__(self, zone, rows=5, cols=6, capacity=3, padding_top=40):
+        self.zone = zone
+        self.rows = rows
+        self.cols = cols
+        self.capacity = capacity  # Agents per cell
+        self.padding_top = padding_top  # Space for the title above the grid
+
+        grid_top = zone.top + padding_top
+        cell_w = zone.width // cols
+        cell_h = (zone.height - padding_top) // rows
+        self.rects = {}
+        for row in range(rows):
+            for col in range(cols):
+                self.rects[(row, col)] = pygame.Rect(zone.left + col * cell_w, grid_top + row * cell_h, cell_w, cell_h)
+
+        self.occupants = {cell: [] for cell in self.rects}
+        self.free = set(self.rects)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def set_capacity(self, capacity):
+        """Change the number of agents per cell, keeping current assignments."""
+        self.capacity = capacity
+        self.free = {cell for cell, agents in self.occupants.items() if len(agents) < capacity}
+
+    def assign(self, agent, cell):
+        occupants = self.occupants[cell]
+        occupants.append(agent)
+        agent.home_grid_cell = cell
+        if len(occupants) >= self.capacity:
+            self.free.discard(cell)
+
+    def release(self, agent):
+        """Take agent out of its cell, if it has one."""
+        cell = getattr(agent, "home_grid_cell", None)
+        if cell is None:
+            return
+        occupants = self.occupants.get(cell)
+        if occupants is not None and agent in occupants:
+            occupants.remove(agent)
+            if len(occupants) < self.capacity:
+                self.free.add(cell)
+        agent.home_grid_cell = None
+
+    def place(self, agents, shuffle_rng, position_rng, margin=10):
+        """
+        Give each agent a cell with room and move it to a random spot in it.
+
+        Agents and free cells are both shuffled first, then cells are filled
+        up to capacity one after another. Returns the agents that did not
+        fit.
+        """
+        agents = list(agents)
+        shuffle_rng.shuffle(agents)
+        cells = sorted(self.free)
+        shuffle_rng.shuffle(cells)
+
+        index = 0
+        for cell in cells:
+            rect = self.rects[cell]
+            occupants = self.occupants[cell]
+            while len(occupants) < self.capacity and index < len(agents):
+                agent = agents[index]
+                self.assign(agent, cell)
+                agent.rect.center = (
+                    position_rng.randint(rect.left + margin, rect.right - margin),
+                    position_rng.randint(rect.top + margin, rect.bottom - margin)
+                )
+                index += 1
+            if index >= len(agents):
+                break
+        return agents[index:]
@@ -0,0 +1,34 @@
+import pygame
+
+# Fonts and rendered HUD text, built on first use
+_fonts = {}  # (name, size) -> pygame.font.Font
+_text_surfaces = {}  # (text, name, size, color) -> rendered Surface
+
+
+def get_font(name, size):
+    """Return the system font name at size, looked up once per process."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, size, color, name='Consolas'):
+    """
+    Return an antialiased rendering of text, rendered once per
+    (text, font, size, color). Every caller gets the same Surface; blit
+    it, never draw on it.
+    """
+    key = (text, name, size, tuple(color))
+    surface = _text_surfaces.get(key)
+    if surface is None:
+        surface = get_font(name, size).render(text, True, color)
+        _text_surfaces[key] = surface
+    return surface
+
+
+def clear_text_cache():
+    """Drop the rendered text (fonts are kept)."""
+    _text_surfaces.clear()
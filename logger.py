@@ -0,0 +1,181 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+
+import numpy as np
+
+# Columns of every simulation log, in file order
+LOG_COLUMNS = (
+    'Day',
+    'Time',
+    'Susceptible',
+    'Exposed',
+    'Believer',
+    'Doubter',
+    'Recovered',
+    'Disinformant',
+    'Total_Misinformed'
+)
+
+
+class BufferedLogger(ABC):
+    """
+    Collects log rows in memory and hands them to the file in bulk.
+
+    Rows are lists in LOG_COLUMNS order. With a run_id the rows get a
+    leading Run_ID column, so logs from many runs can be stacked without
+    relying on their file names. Subclasses write the buffered rows out in
+    flush(); close() flushes once more, so the end of a run only needs it.
+    """
+
+    def __init__(self, path, run_id=None, buffer_rows=500):
+        self.path = path
+        self.run_id = run_id
+        self.buffer_rows = buffer_rows
+        self.columns = (('Run_ID',) if run_id is not None else ()) + LOG_COLUMNS
+        self.rows = []
+        self.written = []  # Rows already handed to a previous flush
+        self.closed = False
+
+    def log(self, row):
+        if self.run_id is not None:
+            row = [self.run_id] + list(row)
+        self.rows.append(row)
+        if self.buffer_rows and len(self.rows) >= self.buffer_rows:
+            self.flush()
+
+    @abstractmethod
+    def flush(self):
+        """Write the buffered rows out and move them to written."""
+
+    def logged_rows(self):
+        """Return every row logged so far, flushed or not, without the Run_ID column."""
+        rows = self.written + self.rows
+        if self.run_id is not None:
+            rows = [row[1:] for row in rows]
+        return rows
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            self.closed = True
+
+
+class CsvLogger(BufferedLogger):
+    """Plain CSV, same layout as the old per-row writer; rows are written buffer_rows at a time."""
+
+    def __init__(self, path, run_id=None, buffer_rows=500):
+        super().__init__(path, run_id, buffer_rows)
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def flush(self):
+        if self.rows:
+            self.writer.writerows(self.rows)
+            self.written += self.rows
+            self.rows = []
+        self.file.flush()
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            self.file.close()
+
+
+class ColumnarLogger(BufferedLogger):
+    """
+    Keeps every row of the run and writes the whole table as columns on
+    flush. A week of 10-minute rows is only ~1000 rows, so the table is
+    written once at the end of the run rather than in chunks.
+    """
+
+    def __init__(self, path, run_id=None, buffer_rows=None):
+        super().__init__(path, run_id, buffer_rows)
+
+    def table(self):
+        """Return the logged rows as {column: NumPy array}."""
+        rows = self.written + self.rows
+        columns = {}
+        for index, name in enumerate(self.columns):
+            values = [row[index] for row in rows]
+            if name in ('Time', 'Run_ID'):
+                columns[name] = np.array(values, dtype=str)
+            else:
+                columns[name] = np.array(values, dtype=np.int64)
+        return columns
+
+    def flush(self):
+        self.write(self.table())
+        self.written += self.rows
+        self.rows = []
+
+    @abstractmethod
+    def write(self, columns):
+        """Write the whole {column: array} table to path."""
+
+
+class NpzLogger(ColumnarLogger):
+    """Compressed NumPy archive with one array per column (np.load(path)['Believer'])."""
+
+    def write(self, columns):
+        with open(self.path, 'wb') as f:
+            np.savez_compressed(f, **columns)
+
+
+def require_engine(log_format, *modules):
+    """Raise ImportError now, not at the end of the run, if none of modules is installed."""
+    if not any(find_spec(module) for module in modules):
+        raise ImportError(f"{log_format} logs need {' or '.join(modules)} (pip install {modules[0]})")
+
+
+class ParquetLogger(ColumnarLogger):
+    """Parquet file through pandas (needs pyarrow or fastparquet)."""
+
+    def __init__(self, path, run_id=None, buffer_rows=None):
+        require_engine("Parquet", "pyarrow", "fastparquet")
+        super().__init__(path, run_id, buffer_rows)
+
+    def write(self, columns):
+        import pandas as pd
+        pd.DataFrame(columns).to_parquet(self.path, index=False)
+
+
+class FeatherLogger(ColumnarLogger):
+    """Feather file through pandas (needs pyarrow)."""
+
+    def __init__(self, path, run_id=None, buffer_rows=None):
+        require_engine("Feather", "pyarrow")
+        super().__init__(path, run_id, buffer_rows)
+
+    def write(self, columns):
+        import pandas as pd
+        pd.DataFrame(columns).to_feather(self.path)
+
+
+# File extension -> logger class
+LOGGER_FORMATS = {
+    '.csv': CsvLogger,
+    '.npz': NpzLogger,
+    '.parquet': ParquetLogger,
+    '.feather': FeatherLogger,
+}
+
+
+def open_logger(path, run_id=None, log_format=None):
+    """
+    Return a logger writing to path.
+
+    The format is picked from log_format ('csv', 'npz', 'parquet',
+    'feather') or, when that is None, from the file extension.
+    """
+    if log_format is None:
+        log_format = os.path.splitext(path)[1].lower() or '.csv'
+    elif not log_format.startswith('.'):
+        log_format = '.' + log_format
+    try:
+        logger_class = LOGGER_FORMATS[log_format]
+    except KeyError:
+        raise ValueError(f"Unknown log format {log_format!r}; expected one of {', '.join(LOGGER_FORMATS)}")
+    return logger_class(path, run_id=run_id)
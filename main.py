@@ -1,39 +1,15 @@
+import argparse
+import json
+import os
 import pygame
 import sys
-import random
 from datetime import datetime, timedelta
-import csv
-import numpy as np
-from scipy.stats import beta
 
-from susceptible import Susceptible
-from exposed import Exposed
-from believer import Believer
-from doubter import Doubter
-from recovered import Recovered
-from disinformant import Disinformant  
-
-def change_probability(agent, influencer=None, environment_factor=1.0, misinformant_exposure=0):
-    """
-    Calculate the probability of an agent changing state.
-    """
-    valence_prob = beta.cdf(agent.emotional_valence, 2, 2)
-    influence = getattr(influencer, 'influence', 1.0) if influencer else 1.0
-    skepticism = getattr(agent, 'skepticism', 0.5)
-    skepticism_factor = 1.0 - skepticism
-    misinfo_bonus = min(0.05 * misinformant_exposure, 0.25)
-    env = environment_factor
-
-    prob = influence * valence_prob * skepticism_factor * env
-    prob += misinfo_bonus
-
-    # Make it rare for Doubters to become Believers
-    if agent.__class__.__name__ == "Doubter" and (
-        influencer and influencer.__class__.__name__ in ["Believer", "Disinformant"]
-    ):
-        prob *= 0.05
-
-    return max(0.0, min(1.0, prob))
+from checkpoint import load_checkpoint
+from hud import get_font, render_text
+from logger import LOGGER_FORMATS
+from population import STATE_NAMES
+from simulation import Simulation
 
 AGENT_TYPES = [
     ("Susceptible", (106, 168, 79)),
@@ -50,7 +26,7 @@ OTHER_FACTORS = [
 
 class Clock:
     def __init__(self, x, y):
-        self.font = pygame.font.SysFont('Consolas', 32)
+        self.font = get_font('Consolas', 32)
         self.position = (x, y)
         self.simulation_time = datetime(2023, 1, 1, 6, 0)
         self.time_multiplier = 10  # 1 hour per real second (10 sec/hour)
@@ -69,8 +45,7 @@ class Clock:
 
     def draw(self, screen):
         time_str = self.simulation_time.strftime("%H:%M")
-        time_surface = self.font.render(time_str, True, (0, 0, 0))
-        screen.blit(time_surface, self.position)
+        screen.blit(render_text(time_str, 32, (0, 0, 0)), self.position)
     
     def get_hour(self):
         return self.simulation_time.hour
@@ -114,8 +89,9 @@ class Slider:
             percent = (rel_x - self.rect.x) / self.rect.width
             self.value = int(self.min_val + percent * (self.max_val - self.min_val))
 
-class Game:
-    def __init__(self):
+class Game(Simulation):
+    def __init__(self, seed=None, minutes_per_frame=1, target_fps=None, profile_path=None,
+                 log_path='simulation_log.csv', log_format=None, checkpoint_path=None, checkpoint_every=None):
         pygame.init()
         self.screen_width = 1400
         self.screen_height = 750
@@ -123,37 +99,20 @@ class Game:
         gameIcon = pygame.image.load('Images/running_down_1.png')
         pygame.display.set_icon(gameIcon)
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        self.clock = pygame.time.Clock()  
+        super().__init__(log_path=log_path, log_format=log_format, seed=seed, profile_path=profile_path,
+                         checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every)
+        self.clock = pygame.time.Clock()
         self.fps = 6000
 
+        # Render decimation: draw one frame every minutes_per_frame simulated
+        # minutes or, with target_fps set, simulate as many minutes as fit
+        # between frames at that rate
+        self.minutes_per_frame = minutes_per_frame
+        self.target_fps = target_fps
+        self.paused = False
+
         # Create game clock
         self.game_clock = Clock(self.screen_width // 2 - 50, 10)
-        
-        # Define environment zones
-        self.zones = {
-            "home": pygame.Rect(0, 100, 380, 650),  # Increased width from 380
-            "work": pygame.Rect(390, 100, 380, 650),  # Increased width from 380
-            "social": pygame.Rect(780, 100, 380, 650)  # Moved right, kept similar width
-        }
-        self.total_misinformed = 0
-
-        # Sprite groups
-        self.collision_group = pygame.sprite.Group()  # New group for collision checks
-        self.all_sprites = pygame.sprite.Group()
-        self.susceptible_group = pygame.sprite.Group()
-        self.exposed_group = pygame.sprite.Group()
-        self.believer_group = pygame.sprite.Group()
-        self.doubter_group = pygame.sprite.Group()
-        self.recovered_group = pygame.sprite.Group()
-        self.disinformant_group = pygame.sprite.Group()  # Uncomment if you have this agent
-
-        # Agent counts
-        self.susceptible_count = 0
-        self.exposed_count = 0
-        self.believer_count = 0
-        self.doubter_count = 0
-        self.recovered_count = 0
-        self.disinformant_count = 0
 
         # Initialize button click flags
         self.add_susceptible = False
@@ -162,95 +121,18 @@ class Game:
         self.add_disinformant = False
 
         self.point_count = 0
-        self.spawn = pygame.Rect(self.screen_width - 1140, self.screen_height - 800, 920, 605)
-
-        self.home_grid_rows = 5
-        self.home_grid_cols = 6
-        self.home_grid_cells = self.home_grid_rows * self.home_grid_cols
-        self.home_grid_assignments = {}  # agent -> (row, col)
-        self.home_grid_agents = {}  # (row, col) -> [agents]
-
-    def get_home_grid_rects(self):
-        """Return a dict of (row, col): pygame.Rect for each grid cell in home zone."""
-        zone = self.zones["home"]
-        padding_top = 40  # Space for the title above the grid
-        grid_top = zone.top + padding_top
-        grid_height = zone.height - padding_top
-        cell_w = zone.width // self.home_grid_cols
-        cell_h = grid_height // self.home_grid_rows
-        grid_rects = {}
-        for row in range(self.home_grid_rows):
-            for col in range(self.home_grid_cols):
-                left = zone.left + col * cell_w
-                top = grid_top + row * cell_h
-                grid_rects[(row, col)] = pygame.Rect(left, top, cell_w, cell_h)
-        return grid_rects
-
-    def assign_agents_to_home_grid(self):
-        """Assign agents to grid cells only if they don't already have an assignment."""
-        agents = [a for a in self.all_sprites if self.zones["home"].collidepoint(a.rect.center) and (not hasattr(a, "home_grid_cell") or a.home_grid_cell is None)]
-        if not agents:
-            return  # No new agents to assign
-
-        random.shuffle(agents)
-        grid_cells = [(r, c) for r in range(self.home_grid_rows) for c in range(self.home_grid_cols)]
-        # Only consider cells with space (max 3 per cell)
-        cell_agents = self.home_grid_agents if hasattr(self, "home_grid_agents") else {cell: [] for cell in grid_cells}
-
-        # Build a list of available cells (cells with < 3 agents)
-        available_cells = [cell for cell in grid_cells if len(cell_agents.get(cell, [])) < 3]
-        random.shuffle(available_cells)
 
-        agent_idx = 0
-        for cell in available_cells:
-            while len(cell_agents.get(cell, [])) < 3 and agent_idx < len(agents):
-                agent = agents[agent_idx]
-                if cell not in cell_agents:
-                    cell_agents[cell] = []
-                cell_agents[cell].append(agent)
-                agent.home_grid_cell = cell
-                # Move agent to random position within their assigned cell
-                grid_rects = self.get_home_grid_rects()
-                rect = grid_rects[cell]
-                agent.rect.center = (
-                    random.randint(rect.left + 10, rect.right - 10),
-                    random.randint(rect.top + 10, rect.bottom - 10)
-                )
-                agent_idx += 1
-            if agent_idx >= len(agents):
-                break
-
-        self.home_grid_agents = cell_agents
-
-    def clear_home_grid_assignment(self, agent):
-        """Clear agent's grid assignment when leaving home zone."""
-        if hasattr(agent, "home_grid_cell"):
-            cell = agent.home_grid_cell
-            if cell in self.home_grid_agents and agent in self.home_grid_agents[cell]:
-                self.home_grid_agents[cell].remove(agent)
-            agent.home_grid_cell = None
-
-    def enforce_home_grid_boundaries(self, agent):
-        """Keep agent within their assigned grid cell in home zone."""
-        if hasattr(agent, "home_grid_cell") and agent.home_grid_cell is not None:
-            grid_rects = self.get_home_grid_rects()
-            if agent.home_grid_cell in grid_rects:
-                rect = grid_rects[agent.home_grid_cell]
-                # Clamp agent position to grid cell
-                agent.rect.left = max(agent.rect.left, rect.left + 2)
-                agent.rect.right = min(agent.rect.right, rect.right - 2)
-                agent.rect.top = max(agent.rect.top, rect.top + 2)
-                agent.rect.bottom = min(agent.rect.bottom, rect.bottom - 2)
-        # else: do nothing if no grid cell assigned
-
-    def set_next_switch_time(self, agent, current_time, to_social):
-        if to_social:
-            # Social media: 20-30 min
-            minutes = random.randint(20, 30)
-        else:
-            # Home: 5-15 min
-            minutes = random.randint(5, 15)
-        agent.next_switch_time = (current_time.hour * 60 + current_time.minute) + minutes
+        # Rendering caches: the static zone backdrop, the sprite group that
+        # tracks which screen areas changed, and the sleeping-agent overlay
+        self.background = None
+        self.render_group = pygame.sprite.RenderUpdates()
+        self.sleeping_images = {}
+        self.full_redraw = True
+        self.shown_clock = None  # Clock text and stats currently on screen
+        self.shown_stats = None
+        self.clock_rect = pygame.Rect(self.game_clock.position, (120, 40))
+        self.stats_rect = pygame.Rect(self.screen_width - 225, self.screen_height - 665, 225, 530)
+        self.spawn = pygame.Rect(self.screen_width - 1140, self.screen_height - 800, 920, 605)
 
     def main_menu(self):
         font = pygame.font.SysFont('Consolas', 44)
@@ -319,489 +201,221 @@ class Game:
             self.clock.tick(30)
         return {slider.label: slider.value for slider in sliders}
 
-    def initialize_agents(self, counts):
-        agent_class_map = {
-            "Susceptible": (Susceptible, self.susceptible_group, "susceptible_count"),
-            "Exposed": (Exposed, self.exposed_group, "exposed_count"),
-            "Believer": (Believer, self.believer_group, "believer_count"),
-            "Doubter": (Doubter, self.doubter_group, "doubter_count"),
-            "Recovered": (Recovered, self.recovered_group, "recovered_count"),
-            "Disinformant": (Disinformant, self.disinformant_group, "disinformant_count"),
-        }
-        home_zone = self.zones["home"]
-        for agent_type, count in counts.items():
-            if agent_type in agent_class_map:
-                agent_class, group, count_attr = agent_class_map[agent_type]
-                for _ in range(count):
-                    agent = agent_class(group, self.all_sprites)
-                    # Place agent in home zone at spawn
-                    padding = 10
-                    new_x = random.randint(home_zone.left + padding, home_zone.right - padding)
-                    new_y = random.randint(home_zone.top + padding, home_zone.bottom - padding)
-                    agent.rect.center = (new_x, new_y)
-                    agent.direction_vector = pygame.math.Vector2(
-                        random.choice([-0.5, 0.5]),
-                        random.choice([-0.5, 0.5])
-                    ).normalize()
-                    agent.next_switch_time = 0
-
-                    # --- Set agent factors according to your table ---
-                    if agent_type == "Susceptible":
-                        agent.emotional_valence = 0.5
-                        agent.skepticism = random.uniform(0.15, 0.3)
-                        agent.influence = 0.4
-                    elif agent_type == "Doubter":
-                        agent.emotional_valence = 0.5
-                        agent.skepticism = random.uniform(0.85, 0.95)  # Increased skepticism
-                        agent.influence = 0.4
-                    elif agent_type == "Exposed":
-                        agent.emotional_valence = 0.5
-                        agent.skepticism = random.uniform(0.15, 0.3)
-                        agent.influence = 0.4
-                    elif agent_type == "Believer":
-                        agent.emotional_valence = 0.5
-                        agent.skepticism = random.uniform(0.7, 0.85)
-                        agent.influence = 0.4
-                    elif agent_type == "Recovered":
-                        agent.influence = 0.4
-                    elif agent_type == "Disinformant":
-                        agent.misinfo_bonus = 0.8  # Used in change_probability
-
-                    self.collision_group.add(agent)
-                    self.all_sprites.add(agent)
-                    group.add(agent)
-                    setattr(self, count_attr, getattr(self, count_attr) + 1)
+    def build_background(self):
+        """Render the white screen, zones, labels and home grid once into a surface."""
+        background = pygame.Surface((self.screen_width, self.screen_height)).convert()
+        background.fill((255, 255, 255))
+        self.draw_zones(background)
+        return background
 
-    def draw_zones(self):
+    def draw_zones(self, surface=None):
+        surface = surface or self.screen
         # Draw zone backgrounds
-        pygame.draw.rect(self.screen, (230, 240, 255), self.zones["home"])  # Light blue for home
-        pygame.draw.rect(self.screen, (255, 230, 230), self.zones["work"])  # Light red for work
-        pygame.draw.rect(self.screen, (230, 255, 230), self.zones["social"])  # Light green for social
+        pygame.draw.rect(surface, (230, 240, 255), self.zones["home"])  # Light blue for home
+        pygame.draw.rect(surface, (255, 230, 230), self.zones["work"])  # Light red for work
+        pygame.draw.rect(surface, (230, 255, 230), self.zones["social"])  # Light green for social
         
         # Draw zone labels
-        font = pygame.font.SysFont('Consolas', 24)
+        font = get_font('Consolas', 24)
         home_label = font.render("HOME", True, (0, 0, 0))
         work_label = font.render("WORK", True, (0, 0, 0))
         social_label = font.render("SOCIAL MEDIA", True, (0, 0, 0))
         
-        self.screen.blit(home_label, (self.zones["home"].x + 150, self.zones["home"].y + 10)) 
-        self.screen.blit(work_label, (self.zones["work"].x + 150, self.zones["work"].y + 10))
-        self.screen.blit(social_label, (self.zones["social"].x + 120, self.zones["social"].y + 10))
+        surface.blit(home_label, (self.zones["home"].x + 150, self.zones["home"].y + 10)) 
+        surface.blit(work_label, (self.zones["work"].x + 150, self.zones["work"].y + 10))
+        surface.blit(social_label, (self.zones["social"].x + 120, self.zones["social"].y + 10))
         
         # Draw zone borders
-        pygame.draw.rect(self.screen, (0, 0, 0), self.zones["home"], 2)
-        pygame.draw.rect(self.screen, (0, 0, 0), self.zones["work"], 2)
-        pygame.draw.rect(self.screen, (0, 0, 0), self.zones["social"], 2)
+        pygame.draw.rect(surface, (0, 0, 0), self.zones["home"], 2)
+        pygame.draw.rect(surface, (0, 0, 0), self.zones["work"], 2)
+        pygame.draw.rect(surface, (0, 0, 0), self.zones["social"], 2)
 
         # Draw grid lines in home zone
         grid_rects = self.get_home_grid_rects()
         for rect in grid_rects.values():
-            pygame.draw.rect(self.screen, (180, 180, 180), rect, 1)
-    
-    def enforce_zone_boundaries(self, agent):
-        """Keep agent within their current zone boundaries and help them escape corners"""
-        current_zone = None
-
-        # Determine which zone the agent is in
-        for zone_name, zone_rect in self.zones.items():
-            if zone_rect.collidepoint(agent.rect.center):
-                current_zone = zone_rect
-                break
-
-        if current_zone:
-            padding = 10  # Small buffer from edges
-            # Store old position for comparison
-            old_left, old_top = agent.rect.left, agent.rect.top
-            old_right, old_bottom = agent.rect.right, agent.rect.bottom
-
-            # Clamp position
-            agent.rect.left = max(agent.rect.left, current_zone.left + padding)
-            agent.rect.right = min(agent.rect.right, current_zone.right - padding)
-            agent.rect.top = max(agent.rect.top, current_zone.top + padding)
-            agent.rect.bottom = min(agent.rect.bottom, current_zone.bottom - padding)
-
-            # If agent was clamped (i.e., touching a wall), randomize direction away from wall
-            stuck = (
-                agent.rect.left == current_zone.left + padding or
-                agent.rect.right == current_zone.right - padding or
-                agent.rect.top == current_zone.top + padding or
-                agent.rect.bottom == current_zone.bottom - padding
-            )
-            if stuck:
-                # Pick a direction away from the wall/corner
-                dx = random.choice([-1, 1])
-                dy = random.choice([-1, 1])
-                # If at left or right wall, force x direction away
-                if agent.rect.left == current_zone.left + padding:
-                    dx = 1
-                elif agent.rect.right == current_zone.right - padding:
-                    dx = -1
-                # If at top or bottom wall, force y direction away
-                if agent.rect.top == current_zone.top + padding:
-                    dy = 1
-                elif agent.rect.bottom == current_zone.bottom - padding:
-                    dy = -1
-                agent.direction_vector = pygame.math.Vector2(dx, dy).normalize()
+            pygame.draw.rect(surface, (180, 180, 180), rect, 1)
+
+    def run(self, counts=None, sim_days=None):
+        # --- Main menu for simulation duration, unless given ---
+        if sim_days is None:
+            sim_choice = self.main_menu()
+            if sim_choice == "day":
+                sim_days = 1
+            else:
+                sim_days = 7
+
+        if counts is None:
+            counts = self.setup_screen()
+        self.start(counts, sim_days)
+        self.render_group.add(self.all_sprites)
+        self.background = self.build_background()
+        self.full_redraw = True
+        self.game_clock.last_update = pygame.time.get_ticks()
 
-    def update_agent_locations(self):
-        current_hour = self.game_clock.get_hour()
-        current_minute = self.game_clock.get_minute()
+        self.update_caption()
+        while self.running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    self.close()
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    self.handle_speed_key(event.key)
 
-        # Force all agents to home zone during sleep (00:00–07:00)
-        if 0 <= current_hour < 7 or (current_hour == 6 and current_minute < 45):
-            zone = self.zones["home"]
-            for agent in self.all_sprites:
-                if not zone.collidepoint(agent.rect.center):
-                    self.move_agent_to_zone(agent, zone)
-                # Assign grid cell if not already assigned
-                if not hasattr(agent, "home_grid_cell") or agent.home_grid_cell is None:
-                    self.assign_agents_to_home_grid()
+            if self.paused:
+                self.clock.tick(30)
+                continue
+            self.advance_frame()
+            if self.profiler is not None:
+                self.profiler.mark()
+            self.draw_frame()
+            self.lap("draw")
+            self.clock.tick(self.target_fps or self.fps)
+        self.close()
+
+    def advance_frame(self):
+        """Simulate the minutes that go between two displayed frames."""
+        if self.target_fps:
+            deadline = pygame.time.get_ticks() + 1000 / self.target_fps
+            while self.running:
+                self.step()
+                if pygame.time.get_ticks() >= deadline:
+                    break
+        else:
+            for _ in range(self.minutes_per_frame):
+                if not self.running:
+                    break
+                self.step()
+
+    def handle_speed_key(self, key):
+        """
+        Live speed controls: Up/+ and Down/- double or halve the minutes per
+        frame, F toggles a 30 fps frame-rate target, Space pauses.
+        """
+        if key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.minutes_per_frame = min(self.minutes_per_frame * 2, 1440)
+            self.target_fps = None
+        elif key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.minutes_per_frame = max(self.minutes_per_frame // 2, 1)
+            self.target_fps = None
+        elif key == pygame.K_f:
+            self.target_fps = None if self.target_fps else 30
+        elif key == pygame.K_SPACE:
+            self.paused = not self.paused
+        else:
             return
+        self.update_caption()
 
-        # Social media hours: 07:00-08:00 and 19:00-21:00
-        if (7 <= current_hour < 8) or (19 <= current_hour < 21):
-            current_total_minutes = current_hour * 60 + current_minute
-            for agent in self.all_sprites:
-                # If agent doesn't have a next_switch_time, set it based on current state
-                if not hasattr(agent, "next_switch_time") or agent.next_switch_time == 0:
-                    if not getattr(agent, "in_social", False):
-                        self.set_next_switch_time(agent, self.game_clock.simulation_time, to_social=True)
-                    else:
-                        self.set_next_switch_time(agent, self.game_clock.simulation_time, to_social=False)
-
-                # Time to switch?
-                if current_total_minutes >= agent.next_switch_time:
-                    agent.in_social = not getattr(agent, "in_social", False)
-                    self.set_next_switch_time(agent, self.game_clock.simulation_time, to_social=agent.in_social)
-
-                # Move agent to correct zone if needed
-                if getattr(agent, "in_social", False):
-                    # Agent should be in social media zone
-                    zone = self.zones["social"]
-                    if not zone.collidepoint(agent.rect.center):
-                        self.move_agent_to_zone(agent, zone)
-                    # Clear grid assignment if leaving home
-                    self.clear_home_grid_assignment(agent)
-                else:
-                    # Agent should be in home zone
-                    zone = self.zones["home"]
-                    if not zone.collidepoint(agent.rect.center):
-                        self.move_agent_to_zone(agent, zone)
-                    # Assign grid cell if not already assigned
-                    if not hasattr(agent, "home_grid_cell") or agent.home_grid_cell is None:
-                        self.assign_agents_to_home_grid()
-            return  # Prevent further movement logic
-
-        # Determine target zone based on time
-        if 6 <= current_hour < 7:
-            target_zone = "home"
-        elif 8 <= current_hour < 16:
-            target_zone = "work"
+    def update_caption(self):
+        if self.paused:
+            speed = "paused"
+        elif self.target_fps:
+            speed = f"{self.target_fps} fps"
         else:
-            target_zone = "home"
-
-        zone = self.zones[target_zone]
-        for agent in self.all_sprites:
-            if not zone.collidepoint(agent.rect.center):
-                self.move_agent_to_zone(agent, zone)
-                # If leaving home, clear grid assignment
-                if target_zone != "home":
-                    self.clear_home_grid_assignment(agent)
-            # --- Only assign grid cell if agent is in home and has no assignment ---
-            if target_zone == "home" and (not hasattr(agent, "home_grid_cell") or agent.home_grid_cell is None):
-                self.assign_agents_to_home_grid()
-
-    def move_agent_to_zone(self, agent, zone):
-        padding = 10  # Same padding as enforce_zone_boundaries
-        new_x = random.randint(zone.left + padding, zone.right - padding)
-        new_y = random.randint(zone.top + padding, zone.bottom - padding)
-        agent.rect.center = (new_x, new_y)
-        
-        # Reset direction to prevent immediate boundary collision
-        agent.direction_vector = pygame.math.Vector2(
-            random.choice([-0.5, 0.5]),
-            random.choice([-0.5, 0.5])
-        ).normalize()
+            speed = f"{self.minutes_per_frame} min/frame"
+        pygame.display.set_caption(f"Misinformation Spread Simulation ({speed})")
+
+    def draw_frame(self):
+        """
+        Draw the current simulation state.
+
+        The zones come from the cached background. After a full frame only
+        the areas that changed (old and new sprite rects, the clock and the
+        stats box) are repainted and pushed to the display.
+        """
+        self.game_clock.simulation_time = self.simulation_time
+        if self.background is None:
+            self.background = self.build_background()
+        screen = self.screen
+
+        # --- SLEEP HOURS: show sleeping agents ---
+        if self.phase == "sleep":
+            screen.blit(self.background, (0, 0))
+            self.game_clock.draw(screen)
+            for agent in self.all_sprites:
+                screen.blit(self.sleeping_image(agent.rect.size), agent.rect)
+            pygame.display.flip()
+            # The grey boxes are not tracked by the sprite group
+            self.full_redraw = True
+            return
 
-    def setup_logging(self):
-        """Initialize logging system with CSV file"""
-        self.log_file = open('simulation_log.csv', 'w', newline='')
-        self.log_writer = csv.writer(self.log_file)
-        self.log_writer.writerow([
-            'Day',
-            'Time', 
-            'Susceptible', 
-            'Exposed', 
-            'Believer', 
-            'Doubter', 
-            'Recovered', 
-            'Disinformant',
-            'Total_Misinformed'
-        ])
-        self.last_log_time = -1  # Initialize to ensure first log at 00:00
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            self.render_group.draw(screen)
+            self.game_clock.draw(screen)
+            self.draw_stats_box()
+            pygame.display.flip()
+            self.shown_clock = self.time_of_day()
+            self.shown_stats = self.stats_snapshot()
+            self.full_redraw = False
+            return
 
-    def log_current_state(self, current_time):
-        """Log current agent counts to file"""
-        day_num = (current_time - datetime(2023, 1, 1, 6, 0)).days + 1  # Day 1-based
-        time_str = current_time.strftime("%H:%M")
-        self.log_writer.writerow([
-            day_num,
-            time_str,
+        # Normal drawing for active agents: erase last frame's sprites, redraw them
+        self.render_group.clear(screen, self.background)
+        dirty = self.render_group.draw(screen)
+        # The clock and stats box only change when the minute or a count does,
+        # or when a roaming sprite was drawn or erased underneath them
+        clock_text = self.time_of_day()
+        if clock_text != self.shown_clock or self.clock_rect.collidelist(dirty) != -1:
+            self.repaint_area(self.clock_rect)
+            self.game_clock.draw(screen)
+            dirty.append(self.clock_rect)
+        stats = self.stats_snapshot()
+        if stats != self.shown_stats or self.stats_rect.collidelist(dirty) != -1:
+            self.repaint_area(self.stats_rect)
+            self.draw_stats_box()
+            dirty.append(self.stats_rect)
+        self.shown_clock = clock_text
+        self.shown_stats = stats
+        pygame.display.update(dirty)
+
+    def repaint_area(self, rect):
+        """Restore rect to background plus the sprites under it, ready for an overlay."""
+        screen = self.screen
+        screen.blit(self.background, rect, rect)
+        screen.set_clip(rect)
+        for sprite in self.render_group:
+            if sprite.rect.colliderect(rect):
+                screen.blit(sprite.image, sprite.rect)
+        screen.set_clip(None)
+
+    def sleeping_image(self, size):
+        """Return the shared grey overlay for a sleeping agent of the given size."""
+        image = self.sleeping_images.get(size)
+        if image is None:
+            image = pygame.Surface(size)
+            image.fill((200, 200, 200))  # Light gray
+            image.set_alpha(200)  # Slightly transparent
+            self.sleeping_images[size] = image
+        return image
+
+    def stats_snapshot(self):
+        """Return everything the stats box shows, to tell when it needs repainting."""
+        return (
+            self.total_misinformed,
             self.susceptible_count,
             self.exposed_count,
             self.believer_count,
             self.doubter_count,
             self.recovered_count,
             self.disinformant_count,
-            self.total_misinformed
-        ])
-        self.log_file.flush()  # Ensure data is written to disk
-
-    def get_environment_factor(self, pos):
-        """Return a factor based on the agent's zone."""
-        if self.zones["home"].collidepoint(pos):
-            return 1.0
-        elif self.zones["work"].collidepoint(pos):
-            return 0.5
-        elif self.zones["social"].collidepoint(pos):
-            return 0.7
-        return 1.0  # Default if not in any zone
-
-    def run(self):
-        # --- Main menu for simulation duration ---
-        sim_choice = self.main_menu()
-        if sim_choice == "day":
-            sim_days = 1
-        else:
-            sim_days = 7
-
-        counts = self.setup_screen()
-        self.global_emotional_valence = counts.get("Emotional Valence", 5) / 10.0
-        self.initialize_agents(counts)
-        self.setup_logging()
-
-        sim_start_time = datetime(2023, 1, 1, 6, 0)
-        self.sim_end_time = sim_start_time + timedelta(days=sim_days)
-        self.game_clock.simulation_time = sim_start_time
-        self.game_clock.last_update = pygame.time.get_ticks()
-
-        # --- NEW: Set fixed simulation step (e.g., 1 minute per frame) ---
-        SIM_STEP_MINUTES = 1  # 1 simulated minute per frame/update
-
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    pygame.quit()
-                    sys.exit()
-
-            # --- Instead of self.game_clock.update(), manually advance time ---
-            self.game_clock.simulation_time += timedelta(minutes=SIM_STEP_MINUTES)
-
-            current_hour = self.game_clock.get_hour()
-            current_minute = self.game_clock.get_minute()
-
-            # --- SLEEP HOURS: 00:00-06:45 ---
-            if 0 <= current_hour < 7 or (current_hour == 6 and current_minute < 45):
-                home_zone = self.zones["home"]
-                padding = 10
-                for agent in self.all_sprites:
-                    agent.rect.left = max(agent.rect.left, home_zone.left + padding)
-                    agent.rect.right = min(agent.rect.right, home_zone.right + padding)
-                    agent.rect.top = max(agent.rect.top, home_zone.top + padding)
-                    agent.rect.bottom = min(agent.rect.bottom, home_zone.bottom + padding)
-                self.screen.fill((255, 255, 255))
-                self.draw_zones()
-                self.game_clock.draw(self.screen)
-                for agent in self.all_sprites:
-                    sleeping_img = pygame.Surface((agent.rect.width, agent.rect.height))
-                    sleeping_img.fill((200, 200, 200))
-                    sleeping_img.set_alpha(200)
-                    self.screen.blit(sleeping_img, agent.rect)
-                pygame.display.flip()
-                self.clock.tick(self.fps)
-                if self.game_clock.simulation_time >= self.sim_end_time:
-                    print("Simulation complete.")
-                    self.log_current_state(self.game_clock.simulation_time)
-                    running = False
-                continue
-
-            # --- SOCIAL MEDIA HOURS: 07:00-08:00 and 19:00-21:00 ---
-            if (7 <= current_hour < 8) or (19 <= current_hour < 21):
-                self.update_agent_locations()
-                # Restrict home agents to their grid cell and only check collisions within each cell
-                for agent in self.all_sprites:
-                    if hasattr(agent, "in_social") and not agent.in_social:
-                        self.enforce_home_grid_boundaries(agent)
-                for cell, agents in self.home_grid_agents.items():
-                    for i, agent in enumerate(agents):
-                        for other in agents[i+1:]:
-                            if pygame.sprite.collide_rect(agent, other):
-                                agent.handle_collision(other)
-                                other.handle_collision(agent)
-                self.all_sprites.update()
-                for agent in self.all_sprites:
-                    if hasattr(agent, "in_social") and not agent.in_social:
-                        self.enforce_home_grid_boundaries(agent)
-                # Drawing and logging
-                self.screen.fill((255, 255, 255))
-                self.draw_zones()
-                self.game_clock.draw(self.screen)
-                self.all_sprites.draw(self.screen)
-                # Draw stats box and counts (your code)
-                self.draw_stats_box()
-                pygame.display.flip()
-                self.clock.tick(self.fps)
-                if self.game_clock.simulation_time >= self.sim_end_time:
-                    print("Simulation complete.")
-                    self.log_current_state(self.game_clock.simulation_time)
-                    running = False
-                # --- Custom collision checks ---
-                self.custom_collision_checks(current_hour)
-                continue
-
-            # --- HOME ZONE (not sleep, not social, not work) ---
-            in_social_media_hours = (7 <= current_hour < 8) or (19 <= current_hour < 21)
-            in_work_hours = (8 <= current_hour < 16)
-            if not in_work_hours and not in_social_media_hours:
-                self.update_agent_locations()
-                for cell, agents in self.home_grid_agents.items():
-                    for i, agent in enumerate(agents):
-                        for other in agents[i+1:]:
-                            # Restrict Recovered interaction to home zone only
-                            if (
-                                agent.__class__.__name__ == "Recovered"
-                                or other.__class__.__name__ == "Recovered"
-                            ):
-                                pass  # Both are in home, so allow interaction
-                            if pygame.sprite.collide_rect(agent, other):
-                                agent.handle_collision(other)
-                                other.handle_collision(agent)
-                self.all_sprites.update()
-                for agent in self.all_sprites:
-                    self.enforce_home_grid_boundaries(agent)
-                self.screen.fill((255, 255, 255))
-                self.draw_zones()
-                self.game_clock.draw(self.screen)
-                self.all_sprites.draw(self.screen)
-                self.draw_stats_box()
-                pygame.display.flip()
-                self.clock.tick(self.fps)
-                if self.game_clock.simulation_time >= self.sim_end_time:
-                    print("Simulation complete.")
-                    self.log_current_state(self.game_clock.simulation_time)
-                    running = False
-                self.custom_collision_checks(current_hour)
-                continue
-
-            # --- WORK HOURS: 08:00-16:00 ---
-            if in_work_hours:
-                fast_period = current_minute < 10
-                very_fast_period = (current_hour == 12 and 0 <= current_minute < 30)
-                collisions = pygame.sprite.groupcollide(
-                    self.collision_group, self.collision_group, False, False,
-                    collided=pygame.sprite.collide_rect_ratio(0.8)
-                )
-                for sprite, collided_list in collisions.items():
-                    for other in collided_list:
-                        if sprite != other:
-                            # Prevent Recovered from interacting outside home
-                            if (
-                                sprite.__class__.__name__ == "Recovered"
-                                or other.__class__.__name__ == "Recovered"
-                            ):
-                                home_zone = self.zones["home"]
-                                if not (home_zone.collidepoint(sprite.rect.center) and home_zone.collidepoint(other.rect.center)):
-                                    continue
-                            # Defensive: skip collision if direction_vector is zero for either agent
-                            if (
-                                hasattr(sprite, "direction_vector") and
-                                hasattr(other, "direction_vector") and
-                                (sprite.direction_vector.length_squared() == 0 or other.direction_vector.length_squared() == 0)
-                            ):
-                                if sprite.direction_vector.length_squared() == 0:
-                                    sprite.direction_vector = pygame.math.Vector2(random.choice([-1, 1]), random.choice([-1, 1])).normalize()
-                                if other.direction_vector.length_squared() == 0:
-                                    other.direction_vector = pygame.math.Vector2(random.choice([-1, 1]), random.choice([-1, 1])).normalize()
-                            sprite.handle_collision(other)
-                            other.handle_collision(sprite)
-                for agent in self.all_sprites:
-                    if self.zones["work"].collidepoint(agent.rect.center):
-                        if very_fast_period:
-                            agent.speed = getattr(agent, "base_speed", 2.0) * 2.5
-                        elif fast_period:
-                            agent.speed = getattr(agent, "base_speed", 2.0)
-                        else:
-                            agent.speed = getattr(agent, "base_speed", 2.0) * 0.3
-                self.all_sprites.update()
-                for agent in self.all_sprites:
-                    self.enforce_zone_boundaries(agent)
-                self.update_agent_locations()
-                self.screen.fill((255, 255, 255))
-                self.draw_zones()
-                self.game_clock.draw(self.screen)
-                self.all_sprites.draw(self.screen)
-                self.draw_stats_box()
-                pygame.display.flip()
-                self.clock.tick(self.fps)
-                if self.game_clock.simulation_time >= self.sim_end_time:
-                    print("Simulation complete.")
-                    self.log_current_state(self.game_clock.simulation_time)
-                    running = False
-                self.custom_collision_checks(current_hour)
-                continue
-
-            # --- SOCIAL MEDIA HOURS (fallback, should not be reached) ---
-            collisions = pygame.sprite.groupcollide(
-                self.collision_group, self.collision_group, False, False,
-                collided=pygame.sprite.collide_rect_ratio(0.8)
-            )
-            for sprite, collided_list in collisions.items():
-                for other in collided_list:
-                    if sprite != other:
-                        if (
-                            sprite.__class__.__name__ == "Recovered"
-                            or other.__class__.__name__ == "Recovered"
-                        ):
-                            home_zone = self.zones["home"]
-                            if not (home_zone.collidepoint(sprite.rect.center) and home_zone.collidepoint(other.rect.center)):
-                                continue
-                        sprite.handle_collision(other)
-                        other.handle_collision(sprite)
-            self.all_sprites.update()
-            for agent in self.all_sprites:
-                self.enforce_zone_boundaries(agent)
-            self.update_agent_locations()
-            self.screen.fill((255, 255, 255))
-            self.draw_zones()
-            self.game_clock.draw(self.screen)
-            self.all_sprites.draw(self.screen)
-            self.draw_stats_box()
-            pygame.display.flip()
-            self.clock.tick(self.fps)
-            if self.game_clock.simulation_time >= self.sim_end_time:
-                print("Simulation complete.")
-                self.log_current_state(self.game_clock.simulation_time)
-                running = False
-            self.custom_collision_checks(current_hour)
+        )
 
     def draw_stats_box(self):
-        # Draw the stats box and counts (your code)
+        # Draw the stats box and counts; text comes from the shared HUD cache
         stats_box_rect = pygame.Rect(self.screen_width - 220, self.screen_height - 640, 180, 300)
         pygame.draw.rect(self.screen, (50, 50, 50), stats_box_rect)
-        font32 = pygame.font.SysFont('Concolas', 32)
-        font35 = pygame.font.SysFont('Concolas', 35)
         pygame.draw.circle(self.screen, (160, 0, 0), (self.screen_width - 130, self.screen_height - 205), 65)
-        points_label = pygame.font.SysFont('Concolas', 30).render('Misinformed', True, (20, 20, 10))
-        points_text = pygame.font.SysFont('Concolas', 45).render(str(self.total_misinformed), True, (255, 255, 255))
+        points_label = render_text('Misinformed', 30, (20, 20, 10), 'Concolas')
+        points_text = render_text(str(self.total_misinformed), 45, (255, 255, 255), 'Concolas')
         self.screen.blit(points_label, (self.screen_width - 210, self.screen_height - 320))
         self.screen.blit(points_text, (self.screen_width - 145, self.screen_height - 220))
-        count_title = pygame.font.SysFont('Concolas', 30).render('COUNT', True, (255, 255, 255))
+        count_title = render_text('COUNT', 30, (255, 255, 255), 'Concolas')
         self.screen.blit(count_title, (self.screen_width - 200, self.screen_height - 660))
         def draw_count(label, count, y):
-            label_surf = font32.render(label, True, (255, 255, 255))
-            count_surf = font35.render(str(count), True, (255, 255, 255))
+            label_surf = render_text(label, 32, (255, 255, 255), 'Concolas')
+            count_surf = render_text(str(count), 35, (255, 255, 255), 'Concolas')
             self.screen.blit(label_surf, (self.screen_width - 210, y))
             self.screen.blit(count_surf, (self.screen_width - 120, y))
         draw_count('SU:', self.susceptible_count, self.screen_height - 620)
@@ -811,288 +425,176 @@ class Game:
         draw_count('RE:', self.recovered_count, self.screen_height - 460)
         draw_count('DI:', self.disinformant_count, self.screen_height - 420)
 
-    def custom_collision_checks(self, current_hour):
-        # SUSCEPTIBLE + BELIEVER -> EXPOSED
-        for susceptible in list(self.susceptible_group):
-            for believer in list(self.believer_group):
-                if pygame.sprite.collide_rect(susceptible, believer):
-                    prob = change_probability(
-                        susceptible,
-                        influencer=believer,
-                        environment_factor=self.get_environment_factor(susceptible.rect.center),
-                    )
-                    if np.random.rand() < prob:
-                        # Susceptible → Exposed
-                        new_exposed = Exposed(self.exposed_group, self.all_sprites)
-                        new_exposed.rect.center = susceptible.rect.center
-                        new_exposed.emotional_valence = susceptible.emotional_valence
-                        new_exposed.skepticism = getattr(susceptible, "skepticism", random.uniform(0.2, 0.8))
-                        susceptible.kill()
-                        self.susceptible_count -= 1
-                        self.all_sprites.add(new_exposed)
-                        self.exposed_group.add(new_exposed)
-                        self.exposed_count += 1
-                    break
-
-        # SUSCEPTIBLE + DISINFORMANT -> EXPOSED
-        for susceptible in list(self.susceptible_group):
-            for disinformant in list(self.disinformant_group):
-                if pygame.sprite.collide_rect(susceptible, disinformant):
-                    prob = change_probability(
-                        susceptible,
-                        influencer=disinformant,
-                        environment_factor=self.get_environment_factor(susceptible.rect.center),
-                        misinformant_exposure=1
-                    )
-                    if np.random.rand() < prob:
-                        # Susceptible → Exposed
-                        new_exposed = Exposed(self.exposed_group, self.all_sprites)
-                        new_exposed.rect.center = susceptible.rect.center
-                        new_exposed.emotional_valence = susceptible.emotional_valence
-                        new_exposed.skepticism = getattr(susceptible, "skepticism", random.uniform(0.2, 0.8))
-                        susceptible.kill()
-                        self.susceptible_count -= 1
-                        self.all_sprites.add(new_exposed)
-                        self.exposed_group.add(new_exposed)
-                        self.exposed_count += 1
-                    break
-
-        # EXPOSED + BELIEVER -> BELIEVER
-        for exposed in list(self.exposed_group):
-            for believer in list(self.believer_group):
-                if pygame.sprite.collide_rect(exposed, believer):
-                    prob = change_probability(
-                        exposed,
-                        influencer=believer,
-                        environment_factor=self.get_environment_factor(exposed.rect.center),
-                    )
-                    if np.random.rand() < prob:
-                        # Exposed → Believer
-                        new_believer = Believer(self.believer_group, self.all_sprites)
-                        new_believer.rect.center = exposed.rect.center
-                        new_believer.emotional_valence = exposed.emotional_valence
-                        new_believer.skepticism = getattr(exposed, "skepticism", random.uniform(0.2, 0.8))
-                        exposed.kill()
-                        self.exposed_count -= 1
-                        self.all_sprites.add(new_believer)
-                        self.believer_group.add(new_believer)
-                        self.believer_count += 1
-                    break
-
-        # EXPOSED + DOUBTER -> DOUBTER
-        for exposed in list(self.exposed_group):
-            for doubter in list(self.doubter_group):
-                if pygame.sprite.collide_rect(exposed, doubter):
-                    prob = change_probability(
-                        exposed,
-                        influencer=doubter,
-                        environment_factor=self.get_environment_factor(exposed.rect.center),
-                    )
-                    if np.random.rand() < prob:
-                        # Exposed → Doubter
-                        new_doubter = Doubter(self.doubter_group, self.all_sprites)
-                        new_doubter.rect.center = exposed.rect.center
-                        new_doubter.emotional_valence = exposed.emotional_valence
-                        new_doubter.skepticism = getattr(exposed, "skepticism", random.uniform(0.2, 0.8))
-                        exposed.kill()
-                        self.exposed_count -= 1
-                        self.all_sprites.add(new_doubter)
-                        self.doubter_group.add(new_doubter)
-                        self.doubter_count += 1
-                    break
-
-        # EXPOSED + DISINFORMANT -> BELIEVER
-        for exposed in list(self.exposed_group):
-            for disinformant in list(self.disinformant_group):
-                if pygame.sprite.collide_rect(exposed, disinformant):
-                    prob = change_probability(
-                        exposed,
-                        influencer=disinformant,
-                        environment_factor=self.get_environment_factor(exposed.rect.center),
-                        misinformant_exposure=1
-                    )
-                    if np.random.rand() < prob:
-                        # Exposed → Believer
-                        new_believer = Believer(self.believer_group, self.all_sprites)
-                        new_believer.rect.center = exposed.rect.center
-                        new_believer.emotional_valence = exposed.emotional_valence
-                        new_believer.skepticism = getattr(exposed, "skepticism", random.uniform(0.2, 0.8))
-                        exposed.kill()
-                        self.exposed_count -= 1
-                        self.all_sprites.add(new_believer)
-                        self.believer_group.add(new_believer)
-                        self.believer_count += 1
-                    break
-
-        # BELIEVER + DOUBTER -> BELIEVER → RECOVERED
-        for doubter in list(self.doubter_group):
-            for believer in list(self.believer_group):
-                if pygame.sprite.collide_rect(doubter, believer):
-                    prob = change_probability(
-                        believer,
-                        influencer=doubter,
-                        environment_factor=self.get_environment_factor(believer.rect.center),
-                    )
-                    if np.random.rand() < prob:
-                        # Believer → Recovered
-                        new_recovered = Recovered(self.recovered_group, self.all_sprites)
-                        new_recovered.rect.center = believer.rect.center
-                        new_recovered.skepticism = getattr(believer, "skepticism", random.uniform(0.2, 0.8))
-                        believer.kill()
-                        self.believer_count -= 1
-                        self.all_sprites.add(new_recovered)
-                        self.recovered_group.add(new_recovered)
-                        self.recovered_count += 1
-                    break
-
-        # DOUBTER + DISINFORMANT -> DOUBTER → EXPOSED (rare)
-        for doubter in list(self.doubter_group):
-            for disinformant in list(self.disinformant_group):
-                if pygame.sprite.collide_rect(doubter, disinformant):
-                    prob = change_probability(
-                        doubter,
-                        influencer=disinformant,
-                        environment_factor=self.get_environment_factor(doubter.rect.center),
-                        misinformant_exposure=1
-                    )
-                    if np.random.rand() < prob:
-                        # Doubter → Exposed
-                        new_exposed = Exposed(self.exposed_group, self.all_sprites)
-                        new_exposed.rect.center = doubter.rect.center
-                        new_exposed.emotional_valence = doubter.emotional_valence
-                        new_exposed.skepticism = getattr(doubter, "skepticism", random.uniform(0.2, 0.8))
-                        doubter.kill()
-                        self.doubter_count -= 1
-                        self.all_sprites.add(new_exposed)
-                        self.exposed_group.add(new_exposed)
-                        self.exposed_count += 1
-                    break
-
-        # BELIEVER → SUSCEPTIBLE (forgetting, 20–40 min depending on slider)
-        for agent in list(self.believer_group):
-            expected_minutes = 20 + 20 * self.global_emotional_valence
-            frames = expected_minutes * 60  # 60 fps
-            forget_prob = 1 / frames if frames > 0 else 0
-            if random.random() < forget_prob:
-                self.believer_group.remove(agent)
-                self.susceptible_group.add(agent)
-                agent.__class__ = Susceptible
-                self.believer_count -= 1
-                self.susceptible_count += 1
-
-        # EXPOSED → SUSCEPTIBLE (forgetting, 20–40 min depending on slider)
-        for agent in list(self.exposed_group):
-            expected_minutes = 20 + 20 * self.global_emotional_valence
-            frames = expected_minutes * 60  # 60 fps
-            forget_prob = 1 / frames if frames > 0 else 0
-            if random.random() < forget_prob:
-                self.exposed_group.remove(agent)
-                self.susceptible_group.add(agent)
-                agent.__class__ = Susceptible
-                self.exposed_count -= 1
-                self.susceptible_count += 1
-
-        self.total_misinformed = self.believer_count + self.exposed_count
-
-        # --- Social media specific logic ---
-        if (7 <= current_hour < 8) or (19 <= current_hour < 21):
-            # Agents in social media: move freely
-            # Agents in home: restrict to grid cell
-            for agent in self.all_sprites:
-                if hasattr(agent, "in_social") and not agent.in_social:
-                    # Restrict to grid cell
-                    self.enforce_home_grid_boundaries(agent)
-            # Only check collisions within each grid cell for home agents
-            for cell, agents in self.home_grid_agents.items():
-                for i, agent in enumerate(agents):
-                    for other in agents[i+1:]:
-                        if pygame.sprite.collide_rect(agent, other):
-                            agent.handle_collision(other)
-                            other.handle_collision(agent)
-            # Social agents move/collide as normal (handled by all_sprites.update())
-            self.all_sprites.update()
-            for agent in self.all_sprites:
-                if hasattr(agent, "in_social") and not agent.in_social:
-                    self.enforce_home_grid_boundaries(agent)
-
-        # --- Stop simulation if time is up ---
-        if self.game_clock.simulation_time >= self.sim_end_time:
-            print("Simulation complete.")
-            self.log_current_state(self.game_clock.simulation_time)
-            running = False
-            
-        # Log every 10 minutes
-        current_minute = self.game_clock.get_minute()
-        if current_minute % 10 == 0 and current_minute != self.last_log_time:
-            self.log_current_state(self.game_clock.simulation_time)
-            self.last_log_time = current_minute
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+# Log formats main() and the config accept, as named by logger.open_logger
+LOG_FORMATS = tuple(extension[1:] for extension in LOGGER_FORMATS)
+
+# Run settings a config file may set, with their defaults
+RUN_DEFAULTS = {
+    "counts": {},
+    "emotional_valence": 5,
+    "days": 1,
+    "seed": None,
+    "out": None,  # simulation_log.csv, or the checkpoint's log when resuming
+    "format": None,
+    "headless": False,
+    "profile": None,
+    "checkpoint": None,
+    "checkpoint_every": None,
+    "resume": None,
+}
+
+
+def load_config(path):
+    """
+    Read run settings from a JSON or TOML file.
 
-        # --- Drawing section ---
-        self.screen.fill((255, 255, 255))
-        self.draw_zones()
-        self.game_clock.draw(self.screen)
-        # Show agents at all times except midnight-6am
-        #if not (0 <= current_hour < 6):
-        if True:
-            # 06:00-06:45 - Show sleeping agents
-            if 6 <= current_hour < 7 and current_minute < 30:
-                for agent in self.all_sprites:
-                    sleeping_img = pygame.Surface((agent.rect.width, agent.rect.height))
-                    sleeping_img.fill((200, 200, 200))  # Light gray
-                    sleeping_img.set_alpha(200)  # Slightly transparent
-                    self.screen.blit(sleeping_img, agent.rect)
+    Keys are those of RUN_DEFAULTS; counts maps state names to initial
+    counts, e.g. {"counts": {"Susceptible": 20, "Disinformant": 3}, "days": 7}.
+    """
+    if os.path.splitext(path)[1].lower() == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    else:
+        with open(path) as f:
+            config = json.load(f)
+
+    if not isinstance(config, dict):
+        raise ValueError(f"A config file holds a table of settings, got {type(config).__name__}")
+    unknown = set(config) - set(RUN_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    return config
+
+
+def check_int(name, value, minimum):
+    """Raise ValueError unless value is an int (not a bool) of at least minimum."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+
+
+def run_settings(args):
+    """
+    Merge the defaults, the config file and the command line, later ones
+    winning, and check the type and range of every setting. Any bad value
+    raises ValueError, which main() reports as invalid settings.
+    """
+    settings = dict(RUN_DEFAULTS)
+    if args.config:
+        settings.update(load_config(args.config))
+
+    if not isinstance(settings["counts"], dict):
+        raise ValueError(f"counts must map state names to counts, got {settings['counts']!r}")
+    counts = {}
+    for name, count in settings["counts"].items():
+        if name not in STATE_NAMES:
+            raise ValueError(f"Unknown state {name!r}, expected one of {', '.join(STATE_NAMES)}")
+        counts[name] = count
+    for name in STATE_NAMES:
+        count = getattr(args, name.lower())
+        if count is not None:
+            counts[name] = count
+    for name, count in counts.items():
+        check_int(f"Count of {name}", count, 0)
+    settings["counts"] = counts
+
+    for key in ("emotional_valence", "days", "seed", "out", "format", "profile", "checkpoint",
+                "checkpoint_every", "resume"):
+        value = getattr(args, key)
+        if value is not None:
+            settings[key] = value
+    if args.headless:
+        settings["headless"] = True
+
+    valence = settings["emotional_valence"]
+    if isinstance(valence, bool) or not isinstance(valence, (int, float)) or not 0 <= valence <= 10:
+        raise ValueError(f"Emotional valence must be a number between 0 and 10, got {valence!r}")
+    check_int("days", settings["days"], 1)
+    if settings["seed"] is not None:
+        check_int("seed", settings["seed"], 0)
+    if settings["checkpoint_every"] is not None:
+        check_int("checkpoint_every (simulated minutes)", settings["checkpoint_every"], 1)
+    for key in ("out", "profile", "checkpoint", "resume"):
+        if settings[key] is not None and not isinstance(settings[key], str):
+            raise ValueError(f"{key} must be a path, got {settings[key]!r}")
+    if settings["format"] is not None and settings["format"] not in LOG_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(LOG_FORMATS)}, got {settings['format']!r}")
+    if settings["out"] is not None and settings["format"] is None:
+        # open_logger picks the format from the extension, defaulting to CSV
+        extension = os.path.splitext(settings["out"])[1].lower() or '.csv'
+        if extension not in LOGGER_FORMATS:
+            raise ValueError(f"Unknown log extension {extension!r} for {settings['out']}; "
+                             f"expected one of {', '.join(LOGGER_FORMATS)} or --format")
+    if settings["resume"] is not None and not os.path.isfile(settings["resume"]):
+        raise ValueError(f"No checkpoint to resume at {settings['resume']}")
+    if not isinstance(settings["headless"], bool):
+        raise ValueError(f"headless must be true or false, got {settings['headless']!r}")
+    return settings
+
+
+def main(argv=None):
+    """
+    Start a run from the command line or a config file and return its exit
+    status: 0 on success, 1 if the run failed, 2 for invalid settings.
+    Without any counts the game opens on its menu as before; with counts
+    the menu and sliders are skipped, and --headless runs without a window.
+    --resume continues a checkpoint headlessly.
+    """
+    parser = argparse.ArgumentParser(description="Run the misinformation spread simulation.")
+    parser.add_argument('--config', help="JSON or TOML file with run settings (see RUN_DEFAULTS)")
+    for name in STATE_NAMES:
+        parser.add_argument(f'--{name.lower()}', type=int, help=f"Initial {name} agents")
+    parser.add_argument('--emotional-valence', type=int, help="Emotional valence, 0-10")
+    parser.add_argument('--days', type=int, help="Duration of the run in simulated days")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--out', help="Log path; the extension picks the format")
+    parser.add_argument('--format', choices=LOG_FORMATS)
+    parser.add_argument('--profile', help="Write a per-section timing report to this path")
+    parser.add_argument('--headless', action='store_true', help="Run without opening a window")
+    parser.add_argument('--checkpoint', help="Checkpoint path; may contain {time} for one file per checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, help="Simulated minutes between checkpoints")
+    parser.add_argument('--resume', help="Continue the run saved in this checkpoint, without a window")
+    args = parser.parse_args(argv)
+
+    try:
+        settings = run_settings(args)
+        if settings["headless"] and not settings["counts"] and not settings["resume"]:
+            raise ValueError("A headless run needs initial counts")
+    except (OSError, ValueError) as e:
+        print(f"Invalid run settings: {e}", file=sys.stderr)
+        return 2
+
+    checkpointing = {"checkpoint_path": settings["checkpoint"], "checkpoint_every": settings["checkpoint_every"]}
+    try:
+        if settings["resume"]:
+            overrides = dict(checkpointing, profile_path=settings["profile"])
+            if settings["out"]:
+                overrides.update(log_path=settings["out"], log_format=settings["format"])
+            load_checkpoint(settings["resume"], **overrides).resume()
+        elif settings["headless"]:
+            counts = dict(settings["counts"], **{"Emotional Valence": settings["emotional_valence"]})
+            sim = Simulation(log_path=settings["out"] or "simulation_log.csv", log_format=settings["format"],
+                             seed=settings["seed"], profile_path=settings["profile"], **checkpointing)
+            sim.run(counts, sim_days=settings["days"])
+        else:
+            game = Game(seed=settings["seed"], profile_path=settings["profile"],
+                        log_path=settings["out"] or "simulation_log.csv", log_format=settings["format"],
+                        **checkpointing)
+            if settings["counts"]:
+                counts = dict(settings["counts"], **{"Emotional Valence": settings["emotional_valence"]})
+                game.run(counts, sim_days=settings["days"])
             else:
-                # Normal drawing for active agents
-                self.all_sprites.draw(self.screen)
-                self.draw_stats_box()
-
-        # Interface:
-        # Draw the stats box first
-        stats_box_rect = pygame.Rect(self.screen_width - 220, self.screen_height - 640, 180, 300)  # Narrower (180px) and further right
-        pygame.draw.rect(self.screen, (50, 50, 50), stats_box_rect)
-
-        # Draw the counts inside the box, in white
-        font32 = pygame.font.SysFont('Concolas', 32)
-        font35 = pygame.font.SysFont('Concolas', 35)
-
-        # MISINFORMED section (adjust positions relative to the new box)
-        pygame.draw.circle(self.screen, (160, 0, 0), (self.screen_width - 130, self.screen_height - 205), 65)  # Smaller circle (65 radius)
-        points_label = pygame.font.SysFont('Concolas', 30).render('Misinformed', True, (20, 20, 10))  # Smaller font
-        points_text = pygame.font.SysFont('Concolas', 45).render(str(self.total_misinformed), True, (255, 255, 255))  # Smaller font
-        self.screen.blit(points_label, (self.screen_width - 210, self.screen_height - 320))  # Adjusted position
-        self.screen.blit(points_text, (self.screen_width - 145, self.screen_height - 220))  # Adjusted position
-
-        # COUNT title
-        count_title = pygame.font.SysFont('Concolas', 30).render('COUNT', True, (255, 255, 255))  # Smaller font
-        self.screen.blit(count_title, (self.screen_width - 200, self.screen_height - 660))  # Adjusted position
-
-        # Update the draw_count function for narrower layout:
-        def draw_count(label, count, y):
-            label_surf = font32.render(label, True, (255, 255, 255))
-            count_surf = font35.render(str(count), True, (255, 255, 255))
-            self.screen.blit(label_surf, (self.screen_width - 210, y))  # Adjusted left position
-            self.screen.blit(count_surf, (self.screen_width - 120, y))  # Adjusted right position
-            
-        # Call with proper vertical spacing
-        draw_count('SU:', self.susceptible_count, self.screen_height - 620)
-        draw_count('EX:', self.exposed_count, self.screen_height - 580)
-        draw_count('BE:', self.believer_count, self.screen_height - 540)
-        draw_count('DO:', self.doubter_count, self.screen_height - 500)
-        draw_count('RE:', self.recovered_count, self.screen_height - 460)
-        draw_count('DI:', self.disinformant_count, self.screen_height - 420)
-
-        pygame.display.flip()
-        self.clock.tick(self.fps)
+                game.run()
+    except Exception as e:
+        print(f"Run failed: {e}", file=sys.stderr)
+        return 1
+    return 0
 
-    def __del__(self):
-        """Cleanup method to close log file"""
-        if hasattr(self, 'log_file'):
-            self.log_file.close()
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    sys.exit(main())
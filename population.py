@@ -0,0 +1,239 @@
+import numpy as np
+
+# State codes shared by the array store and the transition kernels
+SUSCEPTIBLE, EXPOSED, BELIEVER, DOUBTER, RECOVERED, DISINFORMANT = range(6)
+STATE_NAMES = ("Susceptible", "Exposed", "Believer", "Doubter", "Recovered", "Disinformant")
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+SPRITE_SIZE = (40, 70)  # Same size as the agent sprites
+SCREEN_BOUNDS = (0, 0, 920, 575)  # Box the sprites' handle_boundaries reflects against
+
+# Per-state movement parameters, indexed by state code (see the agent modules)
+SPEED_RANGE = np.array([
+    (2, 4),   # Susceptible
+    (2, 4),   # Exposed
+    (8, 14),  # Believer
+    (2, 4),   # Doubter
+    (2, 4),   # Recovered
+    (2, 4),   # Disinformant
+])
+# Base turn chance; move() adds the Susceptible, Exposed and Doubter terms
+TURN_PROBABILITY = np.array([0.03, 0.02, 0.01, 0.02, 0.005, 0.02])
+# Believer and Recovered sprites never reflect off the screen box
+REFLECTS_OFF_SCREEN = np.array([True, True, False, True, False, True])
+
+# Initial attributes per state as set by Simulation.initialize_agents:
+# (emotional valence or None for random, skepticism range, influence range);
+# Recovered and Disinformant keep the skepticism drawn by Agent.__init__
+INITIAL_FACTORS = {
+    SUSCEPTIBLE: (0.5, (0.15, 0.3), (0.4, 0.4)),
+    EXPOSED: (0.5, (0.15, 0.3), (0.4, 0.4)),
+    BELIEVER: (0.5, (0.7, 0.85), (0.4, 0.4)),
+    DOUBTER: (0.5, (0.85, 0.95), (0.4, 0.4)),
+    RECOVERED: (None, (0.2, 0.8), (0.4, 0.4)),
+    DISINFORMANT: (None, (0.2, 0.8), (1.5, 3.0)),
+}
+
+
+class Population:
+    """
+    Structure-of-arrays agent store.
+
+    Holds one row per agent in flat NumPy arrays instead of one sprite
+    object per agent, so movement, boundary reflection and zone clamping
+    run as a handful of array operations per tick. Positions are sprite
+    centres in screen pixels; zones are any objects with left/top/right/
+    bottom attributes, such as pygame.Rect.
+
+    Positions stay whole pixels and move like the sprite rects, but the
+    store is not a model run on its own: it has no home-grid cells,
+    neighbor deflection, transitions or schedule, and the work-hour speed
+    multipliers are left to the caller. benchmark.py --population times
+    it next to the sprite steps.
+    """
+
+    def __init__(self, capacity=0, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.size = 0
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))  # Unit direction vector
+        self.speed = np.zeros(capacity)
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self.skepticism = np.zeros(capacity)
+        self.valence = np.zeros(capacity)
+        self.influence = np.zeros(capacity)
+        self.persuasiveness = np.zeros(capacity)  # Doubters only
+        self.exposure_time = np.zeros(capacity, dtype=np.int32)  # Ticks spent Exposed
+        self.home_cell = np.full(capacity, -1, dtype=np.int32)  # Flat grid index, -1 when unassigned
+        self.in_social = np.zeros(capacity, dtype=bool)
+        self.next_switch_time = np.zeros(capacity, dtype=np.int32)
+
+    @classmethod
+    def from_counts(cls, counts, zone, rng=None):
+        """Build a population from a {state name: count} mapping, spawned in zone."""
+        counts = {name: n for name, n in counts.items() if name in STATE_CODES}
+        population = cls(sum(counts.values()), rng=rng)
+        for name, n in counts.items():
+            population.spawn(STATE_CODES[name], n, zone)
+        return population
+
+    def _grow(self, needed):
+        capacity = len(self.speed)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, 2 * capacity)
+        for name in ("position", "velocity", "speed", "state", "skepticism", "valence",
+                     "influence", "persuasiveness", "exposure_time", "home_cell", "in_social", "next_switch_time"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            if name == "home_cell":
+                new.fill(-1)
+            new[:capacity] = old
+            setattr(self, name, new)
+
+    def spawn(self, state, count, zone, padding=10):
+        """Append count agents of the given state at random positions inside zone."""
+        if count <= 0:
+            return slice(self.size, self.size)
+        self._grow(self.size + count)
+        rows = slice(self.size, self.size + count)
+        rng = self.rng
+
+        self.position[rows, 0] = rng.integers(zone.left + padding, zone.right - padding, count, endpoint=True)
+        self.position[rows, 1] = rng.integers(zone.top + padding, zone.bottom - padding, count, endpoint=True)
+        self.velocity[rows] = rng.choice([-1.0, 1.0], size=(count, 2)) / np.sqrt(2)
+        low, high = SPEED_RANGE[state]
+        self.speed[rows] = rng.integers(low, high, count, endpoint=True)
+        self.state[rows] = state
+
+        valence, skepticism, influence = INITIAL_FACTORS[state]
+        self.valence[rows] = rng.uniform(0, 1, count) if valence is None else valence
+        self.skepticism[rows] = rng.uniform(*skepticism, count)
+        self.influence[rows] = rng.uniform(*influence, count)
+        self.persuasiveness[rows] = rng.uniform(0.5, 2.0, count) if state == DOUBTER else 0.0
+        self.exposure_time[rows] = 0
+        self.home_cell[rows] = -1
+        self.in_social[rows] = False
+        self.next_switch_time[rows] = 0
+
+        self.size += count
+        return rows
+
+    def counts(self):
+        """Return the number of agents in each state, indexed by state code."""
+        return np.bincount(self.state[:self.size], minlength=len(STATE_NAMES))
+
+    def zone_ids(self, zones):
+        """Return the index of the zone containing each agent's centre, or -1."""
+        n = self.size
+        x = self.position[:n, 0]
+        y = self.position[:n, 1]
+        ids = np.full(n, -1, dtype=np.int8)
+        # Iterate in reverse so the first matching zone wins, like the sprite code
+        for index in reversed(range(len(zones))):
+            zone = zones[index]
+            inside = (x >= zone.left) & (x < zone.right) & (y >= zone.top) & (y < zone.bottom)
+            ids[inside] = index
+        return ids
+
+    def move(self):
+        """Advance every agent along its direction and apply random turns."""
+        n = self.size
+        # Sprite rects hold whole pixels and round each move half up
+        position = self.position[:n]
+        position += self.velocity[:n] * self.speed[:n, None]
+        np.floor(position + 0.5, out=position)
+
+        state = self.state[:n]
+        turn_probability = TURN_PROBABILITY[state]
+        # Susceptible agents turn more often the less skeptical they are
+        susceptible = state == SUSCEPTIBLE
+        turn_probability[susceptible] += 0.02 * (1 - self.skepticism[:n][susceptible])
+        # Exposed agents more often the longer they have been conflicted
+        exposed = np.flatnonzero(state == EXPOSED)
+        conflict_level = np.minimum(1.0, self.exposure_time[exposed] / 90)
+        turn_probability[exposed] += 0.03 * conflict_level
+        self.exposure_time[exposed] += 1
+        # Doubters less often the more persuasive they are
+        doubter = state == DOUBTER
+        turn_probability[doubter] += 0.01 * (2.0 - self.persuasiveness[:n][doubter])
+        turning = np.flatnonzero(self.rng.random(n) < turn_probability)
+        if len(turning):
+            self.velocity[turning] = self._random_directions(len(turning))
+
+    def reflect_boundaries(self, bounds=SCREEN_BOUNDS):
+        """Flip the velocity component of agents that left the screen box."""
+        n = self.size
+        left, top, right, bottom = bounds
+        half_w, half_h = SPRITE_SIZE[0] / 2, SPRITE_SIZE[1] / 2
+        x = self.position[:n, 0]
+        y = self.position[:n, 1]
+        reflects = REFLECTS_OFF_SCREEN[self.state[:n]]
+        out_x = reflects & ((x - half_w < left) | (x + half_w > right))
+        out_y = reflects & ((y - half_h < top) | (y + half_h > bottom))
+        self.velocity[:n, 0][out_x] *= -1
+        self.velocity[:n, 1][out_y] *= -1
+
+    def clamp_to_zones(self, zones, padding=10):
+        """
+        Keep each agent inside the zone its centre is in.
+
+        Agents pushed back from a wall get a new diagonal direction pointing
+        away from it, as in Simulation.enforce_zone_boundaries.
+        """
+        ids = self.zone_ids(zones)
+        half_w, half_h = SPRITE_SIZE[0] / 2, SPRITE_SIZE[1] / 2
+        for index, zone in enumerate(zones):
+            rows = np.flatnonzero(ids == index)
+            if not len(rows):
+                continue
+            min_x, max_x = zone.left + padding + half_w, zone.right - padding - half_w
+            min_y, max_y = zone.top + padding + half_h, zone.bottom - padding - half_h
+            pos = self.position[rows]
+            np.clip(pos[:, 0], min_x, max_x, out=pos[:, 0])
+            np.clip(pos[:, 1], min_y, max_y, out=pos[:, 1])
+            self.position[rows] = pos
+
+            at_left = pos[:, 0] <= min_x
+            at_right = pos[:, 0] >= max_x
+            at_top = pos[:, 1] <= min_y
+            at_bottom = pos[:, 1] >= max_y
+            stuck = at_left | at_right | at_top | at_bottom
+            if not stuck.any():
+                continue
+            direction = self.rng.choice([-1.0, 1.0], size=(len(rows), 2))
+            direction[at_left, 0] = 1
+            direction[at_right & ~at_left, 0] = -1
+            direction[at_top, 1] = 1
+            direction[at_bottom & ~at_top, 1] = -1
+            self.velocity[rows[stuck]] = direction[stuck] / np.sqrt(2)
+
+    def move_to_zone(self, rows, zone, padding=10):
+        """Teleport the given agents to random positions inside zone, as move_agent_to_zone does."""
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        count = len(rows)
+        if not count:
+            return
+        self.position[rows, 0] = self.rng.integers(zone.left + padding, zone.right - padding, count, endpoint=True)
+        self.position[rows, 1] = self.rng.integers(zone.top + padding, zone.bottom - padding, count, endpoint=True)
+        self.velocity[rows] = self.rng.choice([-1.0, 1.0], size=(count, 2)) / np.sqrt(2)
+
+    def tick(self, zones=None, padding=10):
+        """
+        Run one tick of batched movement and screen reflection, and clamp
+        agents to their zones when zones are given. The sprites are only
+        clamped in work hours, so pass zones for work ticks only.
+        """
+        self.move()
+        self.reflect_boundaries()
+        if zones is not None:
+            self.clamp_to_zones(zones, padding)
+
+    def _random_directions(self, count):
+        # Uniform on the square, normalised, like the sprites' change_direction
+        direction = self.rng.uniform(-1, 1, size=(count, 2))
+        norm = np.hypot(direction[:, 0], direction[:, 1])
+        norm[norm == 0] = 1.0
+        return direction / norm[:, None]
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+from collections import defaultdict
+from time import perf_counter
+
+HISTOGRAM_BUCKETS = 26  # Powers of two in microseconds, the last one open-ended (>= ~33 s)
+
+
+def bucket_label(index):
+    if index == 0:
+        return "<1us"
+    if index == HISTOGRAM_BUCKETS - 1:
+        return f">={2 ** (index - 1)}us"
+    return f"{2 ** (index - 1)}-{2 ** index}us"
+
+
+class SectionStats:
+    """Call count, total, max and a log2 histogram of one section's durations."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_s": self.total,
+            "mean_us": self.total / self.calls * 1e6 if self.calls else 0.0,
+            "max_us": self.max * 1e6,
+            "histogram_us": {
+                bucket_label(index): count for index, count in enumerate(self.histogram) if count
+            },
+        }
+
+
+class PhaseTimer:
+    """
+    Wall-clock timing of a run's sections, split by day phase.
+
+    Code marks the start of a stretch with mark() and closes each section
+    with lap(phase, name), which books the time since the previous mark or
+    lap, so consecutive sections never overlap. tick() books a whole
+    simulated minute. Each (phase, section) keeps a cumulative total and
+    a histogram of the individual durations.
+    """
+
+    def __init__(self):
+        self.sections = defaultdict(SectionStats)  # (phase, section) -> stats
+        self.last = perf_counter()
+
+    def mark(self):
+        self.last = perf_counter()
+
+    def lap(self, phase, name):
+        now = perf_counter()
+        self.sections[(phase, name)].add(now - self.last)
+        self.last = now
+
+    def tick(self, phase, seconds):
+        self.sections[(phase, "tick")].add(seconds)
+
+    def report(self):
+        """Return the timings as a list of dicts, slowest sections first within each phase."""
+        rows = []
+        for (phase, name), stats in self.sections.items():
+            row = {"phase": phase, "section": name}
+            row.update(stats.as_dict())
+            rows.append(row)
+        rows.sort(key=lambda row: (row["phase"], row["section"] != "tick", -row["total_s"]))
+        return rows
+
+    def write(self, path):
+        """Write the report as JSON or, for a .csv path, one row per (phase, section)."""
+        rows = self.report()
+        if os.path.splitext(path)[1].lower() == ".csv":
+            labels = [bucket_label(index) for index in range(HISTOGRAM_BUCKETS)]
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", "section", "calls", "total_s", "mean_us", "max_us"] + labels)
+                for row in rows:
+                    histogram = row["histogram_us"]
+                    writer.writerow(
+                        [row["phase"], row["section"], row["calls"], f"{row['total_s']:.6f}",
+                         f"{row['mean_us']:.1f}", f"{row['max_us']:.1f}"]
+                        + [histogram.get(label, 0) for label in labels]
+                    )
+        else:
+            with open(path, "w") as f:
+                json.dump({"sections": rows}, f, indent=2)
@@ -0,0 +1,94 @@
+import numpy as np
+
+# Independent substreams of every run, in spawn order
+STREAMS = ("movement", "scheduling", "transitions")
+
+
+class Stream:
+    """
+    Drop-in for the random module's random/uniform/randint/choice/shuffle,
+    backed by a numpy.random.Generator.
+
+    Uniforms are drawn from the generator in blocks and handed out one at a
+    time, so the per-call cost stays close to the random module's while the
+    sequence depends only on the generator's seed.
+    """
+
+    def __init__(self, generator, block_size=4096):
+        self.generator = generator
+        self.block_size = block_size
+        self.block = []
+        self.index = 0
+        self.block_start = None  # Generator state the current block was drawn from
+
+    def random(self):
+        """Return the next float in [0, 1)."""
+        if self.index >= len(self.block):
+            self.block_start = self.generator.bit_generator.state
+            self.block = self.generator.random(self.block_size).tolist()
+            self.index = 0
+        value = self.block[self.index]
+        self.index += 1
+        return value
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """Return an integer in [a, b], both ends included, like random.randint."""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, x):
+        """Shuffle a list in place (Fisher-Yates)."""
+        for i in reversed(range(1, len(x))):
+            j = int(self.random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+    def get_state(self):
+        """
+        Return the stream's position as plain data: the generator state the
+        current block came from and how far into it we are, instead of the
+        block itself.
+        """
+        if self.block_start is None:
+            return {"generator": self.generator.bit_generator.state, "index": None}
+        return {"generator": self.block_start, "index": self.index}
+
+    def set_state(self, state):
+        """Continue from a position returned by get_state()."""
+        self.generator.bit_generator.state = state["generator"]
+        if state["index"] is None:
+            self.block_start = None
+            self.block = []
+            self.index = 0
+        else:
+            self.block_start = state["generator"]
+            self.block = self.generator.random(self.block_size).tolist()
+            self.index = state["index"]
+
+
+class RunRandom:
+    """
+    All the randomness of one run, derived from a single seed.
+
+    A numpy SeedSequence built from the seed spawns one Generator per name
+    in STREAMS, so adding draws to one stream (say, a new movement rule)
+    does not shift the others. With seed=None fresh entropy is used; its
+    value is kept in .seed so the run can be replayed.
+    """
+
+    def __init__(self, seed=None):
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        for name, child in zip(STREAMS, sequence.spawn(len(STREAMS))):
+            setattr(self, name, Stream(np.random.default_rng(child)))
+
+    def get_state(self):
+        return {name: getattr(self, name).get_state() for name in STREAMS}
+
+    def set_state(self, state):
+        for name in STREAMS:
+            getattr(self, name).set_state(state[name])
@@ -0,0 +1,117 @@
+from collections import namedtuple
+
+MINUTES_PER_DAY = 24 * 60
+
+# Phases of the simulated day as (start, phase), in order; starts are
+# "HH:MM" strings or minutes after midnight
+DAY_PHASES = (
+    ("00:00", "sleep"),
+    ("07:00", "social"),
+    ("08:00", "work"),
+    ("16:00", "home"),
+    ("19:00", "social"),
+    ("21:00", "home"),
+)
+
+# Zones agents are sent to in each phase; in social hours every agent
+# switches between the first (home) and the second (social media)
+PHASE_ZONES = {
+    "sleep": ("home",),
+    "social": ("home", "social"),
+    "work": ("work",),
+    "home": ("home",),
+}
+
+# Multiplier of the agents' base speed in the phases that set one
+PHASE_SPEEDS = {"work": 0.3}
+
+# (start, end, multiplier) stretches of the day that override PHASE_SPEEDS
+# inside those phases, later entries winning: the first ten minutes of
+# every hour at normal speed and the lunch rush at 12:00-12:30
+SPEED_PERIODS = tuple(
+    (f"{hour:02d}:00", f"{hour:02d}:10", 1.0) for hour in range(24)
+) + (("12:00", "12:30", 2.5),)
+
+LOG_EVERY = 10  # Minutes between log rows
+
+# One row of the timetable: the phase, the speed multiplier (None when the
+# phase leaves speeds alone), the phase's zones, whether a log row is due,
+# and how many minutes the phase still lasts counting this one
+Minute = namedtuple("Minute", ("phase", "speed", "zones", "log_tick", "phase_left"))
+
+
+def minute_of_day(value):
+    """Turn "HH:MM" (or a number of minutes) into minutes after midnight."""
+    if isinstance(value, str):
+        hours, minutes = value.split(":")
+        return int(hours) * 60 + int(minutes)
+    return int(value)
+
+
+class DailySchedule:
+    """
+    A simulated day compiled into one entry per minute.
+
+    phase, speed, zones and log_tick are lists of MINUTES_PER_DAY values,
+    built once from the phase table, the per-phase zones and speeds, the
+    speed periods and the log interval, so the running model looks the
+    minute up instead of re-deriving it from the hour and minute.
+    Alternative days (weekends, shift work) are just other arguments.
+    """
+
+    def __init__(self, phases=DAY_PHASES, phase_zones=PHASE_ZONES, phase_speeds=PHASE_SPEEDS,
+                 speed_periods=SPEED_PERIODS, log_every=LOG_EVERY):
+        starts = sorted((minute_of_day(start), phase) for start, phase in phases)
+        if not starts:
+            raise ValueError("A schedule needs at least one phase")
+
+        # Minutes before the first start belong to the day's last phase
+        self.phase = []
+        current = starts[-1][1]
+        index = 0
+        for minute in range(MINUTES_PER_DAY):
+            while index < len(starts) and starts[index][0] <= minute:
+                current = starts[index][1]
+                index += 1
+            self.phase.append(current)
+
+        self.zones = [phase_zones[phase] for phase in self.phase]
+
+        self.speed = [phase_speeds.get(phase) for phase in self.phase]
+        for start, end, multiplier in speed_periods:
+            for minute in range(minute_of_day(start), minute_of_day(end)):
+                if self.speed[minute] is not None:
+                    self.speed[minute] = multiplier
+
+        self.log_tick = [minute % log_every == 0 for minute in range(MINUTES_PER_DAY)]
+
+
+def compile_timetable(schedule):
+    """
+    Flatten a DailySchedule, or a sequence of them for consecutive days
+    (cycled from day 1, e.g. a week), into a tuple of Minute rows.
+
+    Row i is minute i of the cycle, so the row for minute m since the
+    start of day 1 is timetable[m % len(timetable)].
+    """
+    days = [schedule] if isinstance(schedule, DailySchedule) else list(schedule)
+    if not days:
+        raise ValueError("A timetable needs at least one day")
+    phases = [phase for day in days for phase in day.phase]
+    speeds = [speed for day in days for speed in day.speed]
+    zones = [zone for day in days for zone in day.zones]
+    log_ticks = [tick for day in days for tick in day.log_tick]
+
+    # Minutes left in each phase, counted backwards around the cycle
+    length = len(phases)
+    left = [0] * length
+    run = 0
+    for offset in range(2 * length - 1, -1, -1):
+        minute = offset % length
+        next_minute = (minute + 1) % length
+        run = run + 1 if phases[next_minute] == phases[minute] else 1
+        left[minute] = min(run, length)
+
+    return tuple(
+        Minute(phases[i], speeds[i], zones[i], log_ticks[i], left[i]) for i in range(length)
+    )
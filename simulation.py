@@ -0,0 +1,928 @@
+import math
+import os
+from datetime import datetime, timedelta
+from time import perf_counter
+import numpy as np
+import pygame
+
+from susceptible import Susceptible
+from exposed import Exposed
+from believer import Believer
+from doubter import Doubter
+from recovered import Recovered
+from disinformant import Disinformant
+from checkpoint import save_checkpoint
+from events import EventQueue
+from homegrid import HomeGrid
+from logger import open_logger
+from profiling import PhaseTimer
+from rng import RunRandom
+from schedule import MINUTES_PER_DAY, DailySchedule, compile_timetable
+from spatial import SpatialHash, sweep_and_prune
+from zoneindex import ZoneIndex
+from population import SUSCEPTIBLE, EXPOSED, BELIEVER, DOUBTER, RECOVERED, DISINFORMANT
+
+SIM_START_TIME = datetime(2023, 1, 1, 6, 0)
+SIM_DAY_ONE = SIM_START_TIME.replace(hour=0, minute=0)  # The clock counts minutes from here
+SIM_START_MINUTE = SIM_START_TIME.hour * 60 + SIM_START_TIME.minute
+SIM_STEP_MINUTES = 1  # 1 simulated minute per tick
+
+# Influence multiplier of contacts made in each zone; 1.0 between zones
+ENVIRONMENT_FACTORS = {"home": 1.0, "work": 0.5, "social": 0.7}
+
+def beta22_cdf(x):
+    """CDF of Beta(2, 2) in closed form, 3x^2 - 2x^3 on [0, 1]; works on scalars and arrays."""
+    x = np.clip(x, 0.0, 1.0)
+    return x * x * (3.0 - 2.0 * x)
+
+def change_probability(agent, influencer=None, environment_factor=1.0, misinformant_exposure=0):
+    """
+    Calculate the probability of an agent changing state.
+    """
+    # Beta(2, 2) CDF of the valence, without going through scipy.stats
+    valence = agent.emotional_valence
+    if valence <= 0.0:
+        valence_prob = 0.0
+    elif valence >= 1.0:
+        valence_prob = 1.0
+    else:
+        valence_prob = valence * valence * (3.0 - 2.0 * valence)
+    influence = getattr(influencer, 'influence', 1.0) if influencer else 1.0
+    skepticism = getattr(agent, 'skepticism', 0.5)
+    skepticism_factor = 1.0 - skepticism
+    misinfo_bonus = min(0.05 * misinformant_exposure, 0.25)
+    env = environment_factor
+
+    prob = influence * valence_prob * skepticism_factor * env
+    prob += misinfo_bonus
+
+    # Make it rare for Doubters to become Believers
+    if agent.state == DOUBTER and (
+        influencer and influencer.state in (BELIEVER, DISINFORMANT)
+    ):
+        prob *= 0.05
+
+    return max(0.0, min(1.0, prob))
+
+def change_probability_batch(valence, skepticism, influence, environment_factor,
+                             misinformant_exposure, agent_state, influencer_state):
+    """
+    Vectorized change_probability over arrays of contacts.
+
+    Each argument is an array (or scalar broadcast against them) with one
+    entry per contact; states are the codes from population.py. Pass an
+    influence of 1.0 and an influencer state of -1 for contacts without
+    an influencer.
+    """
+    valence_prob = beta22_cdf(np.asarray(valence, dtype=float))
+    prob = np.asarray(influence, dtype=float) * valence_prob * (1.0 - np.asarray(skepticism, dtype=float))
+    prob = prob * environment_factor
+    prob = prob + np.minimum(0.05 * np.asarray(misinformant_exposure, dtype=float), 0.25)
+
+    # Make it rare for Doubters to become Believers
+    influencer_state = np.asarray(influencer_state)
+    rare = (np.asarray(agent_state) == DOUBTER) & (
+        (influencer_state == BELIEVER) | (influencer_state == DISINFORMANT)
+    )
+    prob = np.where(rare, prob * 0.05, prob)
+
+    return np.clip(prob, 0.0, 1.0)
+
+class Simulation:
+    """
+    Headless misinformation model.
+
+    Runs the zone schedule, home grid, state transitions, forgetting and
+    logging one simulated minute per step() without opening a window,
+    drawing or throttling to a frame rate. Game builds the interactive
+    view on top of it.
+    """
+
+    def __init__(self, log_path='simulation_log.csv', run_id=None, log_format=None, seed=None,
+                 home_grid_rows=5, home_grid_cols=6, home_cell_capacity=None, profile_path=None,
+                 checkpoint_path=None, checkpoint_every=None, schedule=None):
+        # Agent sprites convert their frames against the display surface, so
+        # a windowless run still needs one; the dummy driver never shows it.
+        if not pygame.display.get_init():
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))
+
+        self.screen_width = 1400
+        self.screen_height = 750
+        self.log_path = log_path
+        self.run_id = run_id
+        self.log_format = log_format
+        self.logger = None
+
+        # Seeded movement, scheduling and transition streams; the same
+        # seed and parameters always give the same log
+        self.rng = RunRandom(seed)
+        self.seed = self.rng.seed
+
+        # Optional per-section timing, written to profile_path (.json or .csv) on close
+        self.profile_path = profile_path
+        self.profiler = PhaseTimer() if profile_path else None
+        self.profile_written = False
+
+        # Optional snapshots every checkpoint_every simulated minutes (see
+        # checkpoint.py); checkpoint_path may contain {time}, e.g.
+        # 'run_{time}.json.gz', to keep one file per snapshot
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_due = False
+
+        # Define environment zones
+        self.zones = {
+            "home": pygame.Rect(0, 100, 380, 650),  # Increased width from 380
+            "work": pygame.Rect(390, 100, 380, 650),  # Increased width from 380
+            "social": pygame.Rect(780, 100, 380, 650)  # Moved right, kept similar width
+        }
+        # Zone of every agent, set when it is placed and refiled after it moves
+        self.zone_index = ZoneIndex(self.zones)
+        self.zone_members = self.zone_index.members  # name -> agents in that zone
+        self.total_misinformed = 0
+
+        # Sprite groups
+        self.collision_group = pygame.sprite.Group()  # New group for collision checks
+        self.all_sprites = pygame.sprite.Group()
+        self.susceptible_group = pygame.sprite.Group()
+        self.exposed_group = pygame.sprite.Group()
+        self.believer_group = pygame.sprite.Group()
+        self.doubter_group = pygame.sprite.Group()
+        self.recovered_group = pygame.sprite.Group()
+        self.disinformant_group = pygame.sprite.Group()  # Uncomment if you have this agent
+
+        # Agent counts
+        self.susceptible_count = 0
+        self.exposed_count = 0
+        self.believer_count = 0
+        self.doubter_count = 0
+        self.recovered_count = 0
+        self.disinformant_count = 0
+
+        # State code -> (agent class, group, count attribute) for transition()
+        self.state_table = {
+            SUSCEPTIBLE: (Susceptible, self.susceptible_group, "susceptible_count"),
+            EXPOSED: (Exposed, self.exposed_group, "exposed_count"),
+            BELIEVER: (Believer, self.believer_group, "believer_count"),
+            DOUBTER: (Doubter, self.doubter_group, "doubter_count"),
+            RECOVERED: (Recovered, self.recovered_group, "recovered_count"),
+            DISINFORMANT: (Disinformant, self.disinformant_group, "disinformant_count"),
+        }
+
+        self.home_grid_rows = home_grid_rows
+        self.home_grid_cols = home_grid_cols
+        self.home_grid_cells = self.home_grid_rows * self.home_grid_cols
+        # Agents per cell; None sizes it to the population in start() (at least 3)
+        self.home_cell_capacity = home_cell_capacity
+        self.home_grid = HomeGrid(self.zones["home"], home_grid_rows, home_grid_cols, home_cell_capacity or 3)
+        self.home_grid_agents = self.home_grid.occupants  # (row, col) -> [agents]
+
+        # Neighbor index shared by every overlap query of a tick: built over
+        # all_sprites for the agents' own deflection in update_agents(), then
+        # over the state groups for the contact rules in custom_collision_checks
+        self.neighbors = SpatialHash()
+
+        # Run state
+        self.global_emotional_valence = 0.5
+        self.running = False
+        # Skip the sleep hours in one step instead of minute by minute
+        self.fast_forward = True
+
+        # The daily schedule, compiled to one row per minute (see
+        # schedule.py); a sequence of DailySchedules gives one per day,
+        # cycled from day 1, e.g. a week with a different weekend
+        self.timetable = compile_timetable(schedule if schedule is not None else DailySchedule())
+        # The clock: simulated minutes since midnight of day 1
+        self.minute = SIM_START_MINUTE
+        self.end_minute = SIM_START_MINUTE
+        self.schedule_row = self.timetable[self.minute % len(self.timetable)]
+        self.phase = self.schedule_row.phase
+
+        # Timed events: checkpoints keyed by the clock, agent zone switches
+        # keyed by minute of the day like next_switch_time itself
+        self.events = EventQueue()
+        self.switch_events = EventQueue()
+        self.log_due = False
+
+        # update_agent_locations() visits every agent on entering a phase;
+        # within it, only those that may have to move or need a home cell
+        self.located_phase = None
+        self.agent_order = {}  # Agent -> position in all_sprites
+        self.unhoused = []  # Agents at home the home grid had no room for
+
+    @property
+    def simulation_time(self):
+        """The clock as a datetime, for display and file names."""
+        return SIM_DAY_ONE + timedelta(minutes=self.minute)
+
+    @property
+    def sim_end_time(self):
+        return SIM_DAY_ONE + timedelta(minutes=self.end_minute)
+
+    def time_of_day(self):
+        """Return the clock as "HH:MM"."""
+        hours, minutes = divmod(self.minute % MINUTES_PER_DAY, 60)
+        return f"{hours:02d}:{minutes:02d}"
+
+    def get_home_grid_rects(self):
+        """Return a dict of (row, col): pygame.Rect for each grid cell in home zone."""
+        return self.home_grid.rects
+
+    def assign_agents_to_home_grid(self, agents=None):
+        """
+        Give cells to agents coming home in one pass.
+
+        agents defaults to every agent in the home zone without a cell.
+        Agents that do not fit stay unassigned and are returned, to be
+        retried the next time a cohort is placed.
+        """
+        if agents is None:
+            agents = [a for a in self.all_sprites if a.zone == "home" and a.home_grid_cell is None]
+        if not agents:
+            return []  # No new agents to assign
+        return self.home_grid.place(agents, self.rng.scheduling, self.rng.movement)
+
+    def clear_home_grid_assignment(self, agent):
+        """Clear agent's grid assignment when leaving home zone."""
+        self.home_grid.release(agent)
+
+    def enforce_home_grid_boundaries(self, agent):
+        """Keep agent within their assigned grid cell in home zone."""
+        if hasattr(agent, "home_grid_cell") and agent.home_grid_cell is not None:
+            grid_rects = self.home_grid.rects
+            if agent.home_grid_cell in grid_rects:
+                rect = grid_rects[agent.home_grid_cell]
+                # Clamp agent position to grid cell
+                agent.rect.left = max(agent.rect.left, rect.left + 2)
+                agent.rect.right = min(agent.rect.right, rect.right - 2)
+                agent.rect.top = max(agent.rect.top, rect.top + 2)
+                agent.rect.bottom = min(agent.rect.bottom, rect.bottom - 2)
+                # The clamp can pull an agent that strayed back into the home zone
+                self.zone_index.locate(agent)
+        # else: do nothing if no grid cell assigned
+
+    def set_next_switch_time(self, agent, to_social):
+        if to_social:
+            # Social media: 20-30 min
+            minutes = self.rng.scheduling.randint(20, 30)
+        else:
+            # Home: 5-15 min
+            minutes = self.rng.scheduling.randint(5, 15)
+        agent.next_switch_time = self.minute % MINUTES_PER_DAY + minutes
+        self.switch_events.push(agent.next_switch_time, agent)
+
+    def initialize_agents(self, counts):
+        agent_class_map = {
+            "Susceptible": (Susceptible, self.susceptible_group, "susceptible_count"),
+            "Exposed": (Exposed, self.exposed_group, "exposed_count"),
+            "Believer": (Believer, self.believer_group, "believer_count"),
+            "Doubter": (Doubter, self.doubter_group, "doubter_count"),
+            "Recovered": (Recovered, self.recovered_group, "recovered_count"),
+            "Disinformant": (Disinformant, self.disinformant_group, "disinformant_count"),
+        }
+        home_zone = self.zones["home"]
+        for agent_type, count in counts.items():
+            if agent_type in agent_class_map:
+                agent_class, group, count_attr = agent_class_map[agent_type]
+                for _ in range(count):
+                    agent = agent_class(group, self.all_sprites, rng=self.rng.movement)
+                    agent.neighbors = self.neighbors
+                    # Place agent in home zone at spawn
+                    padding = 10
+                    new_x = self.rng.movement.randint(home_zone.left + padding, home_zone.right - padding)
+                    new_y = self.rng.movement.randint(home_zone.top + padding, home_zone.bottom - padding)
+                    agent.rect.center = (new_x, new_y)
+                    self.zone_index.place(agent, "home")
+                    agent.direction_vector = pygame.math.Vector2(
+                        self.rng.movement.choice([-0.5, 0.5]),
+                        self.rng.movement.choice([-0.5, 0.5])
+                    ).normalize()
+                    agent.next_switch_time = 0
+
+                    # --- Set agent factors according to your table ---
+                    if agent_type == "Susceptible":
+                        agent.emotional_valence = 0.5
+                        agent.skepticism = self.rng.transitions.uniform(0.15, 0.3)
+                        agent.influence = 0.4
+                    elif agent_type == "Doubter":
+                        agent.emotional_valence = 0.5
+                        agent.skepticism = self.rng.transitions.uniform(0.85, 0.95)  # Increased skepticism
+                        agent.influence = 0.4
+                    elif agent_type == "Exposed":
+                        agent.emotional_valence = 0.5
+                        agent.skepticism = self.rng.transitions.uniform(0.15, 0.3)
+                        agent.influence = 0.4
+                    elif agent_type == "Believer":
+                        agent.emotional_valence = 0.5
+                        agent.skepticism = self.rng.transitions.uniform(0.7, 0.85)
+                        agent.influence = 0.4
+                    elif agent_type == "Recovered":
+                        agent.influence = 0.4
+                    elif agent_type == "Disinformant":
+                        agent.misinfo_bonus = 0.8  # Used in change_probability
+
+                    self.collision_group.add(agent)
+                    self.all_sprites.add(agent)
+                    group.add(agent)
+                    setattr(self, count_attr, getattr(self, count_attr) + 1)
+
+    def enforce_zone_boundaries(self, agent):
+        """Keep agent within their current zone boundaries and help them escape corners"""
+        current_zone = self.zone_index.rect(agent)
+
+        if current_zone:
+            padding = 10  # Small buffer from edges
+            # Store old position for comparison
+            old_left, old_top = agent.rect.left, agent.rect.top
+            old_right, old_bottom = agent.rect.right, agent.rect.bottom
+
+            # Clamp position
+            agent.rect.left = max(agent.rect.left, current_zone.left + padding)
+            agent.rect.right = min(agent.rect.right, current_zone.right - padding)
+            agent.rect.top = max(agent.rect.top, current_zone.top + padding)
+            agent.rect.bottom = min(agent.rect.bottom, current_zone.bottom - padding)
+
+            # If agent was clamped (i.e., touching a wall), randomize direction away from wall
+            stuck = (
+                agent.rect.left == current_zone.left + padding or
+                agent.rect.right == current_zone.right - padding or
+                agent.rect.top == current_zone.top + padding or
+                agent.rect.bottom == current_zone.bottom - padding
+            )
+            if stuck:
+                # Pick a direction away from the wall/corner
+                dx = self.rng.movement.choice([-1, 1])
+                dy = self.rng.movement.choice([-1, 1])
+                # If at left or right wall, force x direction away
+                if agent.rect.left == current_zone.left + padding:
+                    dx = 1
+                elif agent.rect.right == current_zone.right - padding:
+                    dx = -1
+                # If at top or bottom wall, force y direction away
+                if agent.rect.top == current_zone.top + padding:
+                    dy = 1
+                elif agent.rect.bottom == current_zone.bottom - padding:
+                    dy = -1
+                agent.direction_vector = pygame.math.Vector2(dx, dy).normalize()
+
+    def agents_to_locate(self, due=()):
+        """
+        Return the agents update_agent_locations() has to look at, in
+        all_sprites order.
+
+        On entering a phase that is every agent. Within a phase an agent
+        only needs a new zone or a home cell if its switch time came (due),
+        if it wandered into another zone since the last call (the zone
+        index's refiled agents), or if the home grid had no room for it.
+        Everyone else is already in its target zone.
+        """
+        refiled = self.zone_index.refiled
+        if self.located_phase != self.phase:
+            self.located_phase = self.phase
+            agents = self.all_sprites.sprites()
+            self.agent_order = {agent: index for index, agent in enumerate(agents)}
+        else:
+            agents = set(refiled)
+            agents.update(due)
+            agents.update(self.unhoused)
+            agents = sorted(agents, key=self.agent_order.__getitem__)
+        refiled.clear()
+        return agents
+
+    def update_agent_locations(self):
+        # Social media hours: 07:00-08:00 and 19:00-21:00
+        if self.phase == "social":
+            current_total_minutes = self.minute % MINUTES_PER_DAY
+            # Only agents whose switch time has come flip zone this minute
+            due = {
+                agent for switch_time, agent in self.switch_events.pop_due(current_total_minutes)
+                if agent.next_switch_time == switch_time
+            }
+            homeless = []  # Agents at home without a cell, placed together below
+            for agent in self.agents_to_locate(due):
+                # If agent doesn't have a next_switch_time, set it based on current state
+                if getattr(agent, "next_switch_time", 0) == 0:
+                    if not getattr(agent, "in_social", False):
+                        self.set_next_switch_time(agent, to_social=True)
+                    else:
+                        self.set_next_switch_time(agent, to_social=False)
+
+                # Time to switch?
+                if agent in due:
+                    agent.in_social = not getattr(agent, "in_social", False)
+                    self.set_next_switch_time(agent, to_social=agent.in_social)
+
+                # Move agent to correct zone if needed
+                if getattr(agent, "in_social", False):
+                    # Agent should be in social media zone
+                    if agent.zone != "social":
+                        self.move_agent_to_zone(agent, "social")
+                    # Clear grid assignment if leaving home
+                    self.clear_home_grid_assignment(agent)
+                else:
+                    # Agent should be in home zone
+                    if agent.zone != "home":
+                        self.move_agent_to_zone(agent, "home")
+                    # Assign grid cell if not already assigned
+                    if not hasattr(agent, "home_grid_cell") or agent.home_grid_cell is None:
+                        homeless.append(agent)
+            self.unhoused = self.assign_agents_to_home_grid(homeless)
+            return  # Prevent further movement logic
+
+        # Outside social hours the schedule sends everyone to one zone
+        target_zone = self.schedule_row.zones[0]
+
+        homeless = []
+        for agent in self.agents_to_locate():
+            if agent.zone != target_zone:
+                self.move_agent_to_zone(agent, target_zone)
+                # If leaving home, clear grid assignment
+                if target_zone != "home":
+                    self.clear_home_grid_assignment(agent)
+            # --- Only assign grid cell if agent is in home and has no assignment ---
+            if target_zone == "home" and (not hasattr(agent, "home_grid_cell") or agent.home_grid_cell is None):
+                homeless.append(agent)
+        self.unhoused = self.assign_agents_to_home_grid(homeless)
+
+    def move_agent_to_zone(self, agent, zone_name):
+        """Teleport agent to a random spot in the named zone and file it there."""
+        zone = self.zones[zone_name]
+        padding = 10  # Same padding as enforce_zone_boundaries
+        new_x = self.rng.movement.randint(zone.left + padding, zone.right - padding)
+        new_y = self.rng.movement.randint(zone.top + padding, zone.bottom - padding)
+        agent.rect.center = (new_x, new_y)
+        self.zone_index.place(agent, zone_name)
+
+        # Reset direction to prevent immediate boundary collision
+        agent.direction_vector = pygame.math.Vector2(
+            self.rng.movement.choice([-0.5, 0.5]),
+            self.rng.movement.choice([-0.5, 0.5])
+        ).normalize()
+
+    def setup_logging(self):
+        """Open the run's logger; the format follows the log path's extension."""
+        self.logger = open_logger(self.log_path, run_id=self.run_id, log_format=self.log_format)
+        self.log_due = False
+
+    def log_current_state(self):
+        """Log current agent counts"""
+        day_num = (self.minute - SIM_START_MINUTE) // MINUTES_PER_DAY + 1  # Day 1-based, from the start time
+        time_str = self.time_of_day()
+        self.logger.log([
+            day_num,
+            time_str,
+            self.susceptible_count,
+            self.exposed_count,
+            self.believer_count,
+            self.doubter_count,
+            self.recovered_count,
+            self.disinformant_count,
+            self.total_misinformed
+        ])
+
+    def get_environment_factor(self, agent):
+        """Return a factor based on the agent's zone."""
+        return ENVIRONMENT_FACTORS.get(agent.zone, 1.0)  # Default if not in any zone
+
+    def start(self, counts, sim_days=1):
+        """Spawn the initial population and reset the clock for a run of sim_days days."""
+        self.global_emotional_valence = counts.get("Emotional Valence", 5) / 10.0
+        self.initialize_agents(counts)
+        if self.home_cell_capacity is None:
+            # Enough room per cell for the whole population to be home at once
+            self.home_grid.set_capacity(max(3, math.ceil(len(self.all_sprites) / self.home_grid_cells)))
+        self.setup_logging()
+        self.minute = SIM_START_MINUTE
+        self.end_minute = SIM_START_MINUTE + sim_days * MINUTES_PER_DAY
+        self.schedule_events()
+        self.running = True
+
+    def schedule_events(self):
+        """Look up the current schedule row and queue the agents' switches and the next checkpoint."""
+        self.events.clear()
+        self.switch_events.clear()
+        for agent in self.all_sprites:
+            if getattr(agent, "next_switch_time", 0):
+                self.switch_events.push(agent.next_switch_time, agent)
+        self.schedule_row = self.timetable[self.minute % len(self.timetable)]
+        self.phase = self.schedule_row.phase
+        self.located_phase = None
+        self.schedule_checkpoint()
+
+    def schedule_checkpoint(self, after=None):
+        """
+        Queue the next checkpoint, when checkpointing is on, checkpoint_every
+        minutes after the minute after (default: the current minute).
+        """
+        if self.checkpoint_path and self.checkpoint_every:
+            start = self.minute if after is None else after
+            self.events.push(start + self.checkpoint_every, ("checkpoint", None))
+
+    def process_events(self):
+        """Fire the checkpoints that are due at the current time."""
+        for key, (kind, _) in self.events.pop_due(self.minute):
+            if kind == "checkpoint":
+                # Written once the current minute is complete; the next one
+                # follows the due time, so the cadence does not drift
+                self.checkpoint_due = True
+                self.schedule_checkpoint(after=key)
+
+    def run(self, counts, sim_days=1):
+        """Run a whole simulation without a display and close the log."""
+        self.start(counts, sim_days)
+        self.resume()
+
+    def resume(self):
+        """Step a started or restored simulation to the end of its run and close the log."""
+        while self.running:
+            self.step()
+        self.close()
+
+    def check_end_of_run(self):
+        """Stop the run once the clock reaches its end, logging the final row once."""
+        if not self.running:
+            return
+        if self.minute >= self.end_minute:
+            print("Simulation complete.")
+            self.log_current_state()
+            # The final row stands in for any log tick of this minute
+            self.log_due = False
+            self.running = False
+
+    def step(self):
+        """Advance the model by one simulated minute, timing it when profiling."""
+        profiler = self.profiler
+        if profiler is None:
+            self.step_minute()
+        else:
+            started = perf_counter()
+            profiler.mark()
+            self.step_minute()
+            profiler.tick(self.phase, perf_counter() - started)
+        if self.checkpoint_due:
+            self.save_checkpoint()
+
+    def save_checkpoint(self, path=None):
+        """Write the whole run state to path (default: checkpoint_path) and return the path."""
+        if path is None:
+            path = self.checkpoint_path.format(time=self.simulation_time.strftime("%Y%m%d-%H%M"))
+        save_checkpoint(self, path)
+        self.checkpoint_due = False
+        return path
+
+    def lap(self, name):
+        """When profiling, book the time since the previous lap to section name."""
+        if self.profiler is not None:
+            self.profiler.lap(self.phase, name)
+
+    def step_minute(self):
+        self.minute += SIM_STEP_MINUTES
+        # Everything the schedule says about this minute, in one lookup
+        row = self.timetable[self.minute % len(self.timetable)]
+        self.schedule_row = row
+        self.phase = phase = row.phase
+        if row.log_tick and phase != "sleep":
+            # Logged at the end of this step; sleep minutes are not logged
+            self.log_due = True
+        if self.events:
+            self.process_events()
+        self.lap("events")
+
+        # --- SLEEP HOURS: 00:00-07:00 ---
+        if phase == "sleep":
+            home_zone = self.zones["home"]
+            padding = 10
+            for agent in self.all_sprites:
+                agent.rect.left = max(agent.rect.left, home_zone.left + padding)
+                agent.rect.right = min(agent.rect.right, home_zone.right + padding)
+                agent.rect.top = max(agent.rect.top, home_zone.top + padding)
+                agent.rect.bottom = min(agent.rect.bottom, home_zone.bottom + padding)
+                self.zone_index.locate(agent)
+            self.lap("boundaries")
+            if self.fast_forward and row.phase_left > 1 and not self.checkpoint_due:
+                # Nobody moves, meets anyone or gets logged until sleep ends and
+                # the clamp above is idempotent, so jump to its last minute, or
+                # to just before the next queued event so it fires on time (a
+                # checkpoint due now is written at this minute, before jumping)
+                target = min(self.minute + row.phase_left - 1, self.end_minute)
+                next_event = self.events.peek_key()
+                if next_event is not None:
+                    target = min(target, next_event - 1)
+                if target > self.minute:
+                    self.skip_to(target)
+            self.check_end_of_run()
+            self.lap("logging")
+            return
+
+        # --- SOCIAL MEDIA HOURS: 07:00-08:00 and 19:00-21:00 ---
+        if phase == "social":
+            self.update_agent_locations()
+            self.lap("locations")
+            # Restrict home agents to their grid cell and only check collisions within each cell
+            for agent in self.all_sprites:
+                if hasattr(agent, "in_social") and not agent.in_social:
+                    self.enforce_home_grid_boundaries(agent)
+            self.lap("boundaries")
+            for cell, agents in self.home_grid_agents.items():
+                for i, agent in enumerate(agents):
+                    for other in agents[i+1:]:
+                        if pygame.sprite.collide_rect(agent, other):
+                            agent.handle_collision(other)
+                            other.handle_collision(agent)
+            self.lap("collisions")
+            self.update_agents()
+            self.lap("update")
+            for agent in self.all_sprites:
+                if hasattr(agent, "in_social") and not agent.in_social:
+                    self.enforce_home_grid_boundaries(agent)
+            self.lap("boundaries")
+            self.check_end_of_run()
+            self.lap("logging")
+            # --- Custom collision checks ---
+            self.custom_collision_checks()
+            return
+
+        # --- HOME ZONE: 16:00-19:00 and 21:00-24:00 ---
+        if phase == "home":
+            self.update_agent_locations()
+            self.lap("locations")
+            for cell, agents in self.home_grid_agents.items():
+                for i, agent in enumerate(agents):
+                    for other in agents[i+1:]:
+                        # Restrict Recovered interaction to home zone only
+                        if (
+                            agent.__class__.__name__ == "Recovered"
+                            or other.__class__.__name__ == "Recovered"
+                        ):
+                            pass  # Both are in home, so allow interaction
+                        if pygame.sprite.collide_rect(agent, other):
+                            agent.handle_collision(other)
+                            other.handle_collision(agent)
+            self.lap("collisions")
+            self.update_agents()
+            self.lap("update")
+            for agent in self.all_sprites:
+                self.enforce_home_grid_boundaries(agent)
+            self.lap("boundaries")
+            self.check_end_of_run()
+            self.lap("logging")
+            self.custom_collision_checks()
+            return
+
+        # --- WORK HOURS: 08:00-16:00 ---
+        if phase == "work":
+            speed = row.speed
+            # Each overlapping pair once, same test as collide_rect_ratio(0.8)
+            for sprite, other in sweep_and_prune(self.collision_group, 0.8):
+                # Prevent Recovered from interacting outside home
+                if sprite.state == RECOVERED or other.state == RECOVERED:
+                    if not (sprite.zone == "home" and other.zone == "home"):
+                        continue
+                # Defensive: skip collision if direction_vector is zero for either agent
+                if (
+                    hasattr(sprite, "direction_vector") and
+                    hasattr(other, "direction_vector") and
+                    (sprite.direction_vector.length_squared() == 0 or other.direction_vector.length_squared() == 0)
+                ):
+                    if sprite.direction_vector.length_squared() == 0:
+                        sprite.direction_vector = pygame.math.Vector2(self.rng.movement.choice([-1, 1]), self.rng.movement.choice([-1, 1])).normalize()
+                    if other.direction_vector.length_squared() == 0:
+                        other.direction_vector = pygame.math.Vector2(self.rng.movement.choice([-1, 1]), self.rng.movement.choice([-1, 1])).normalize()
+                sprite.handle_collision(other)
+                other.handle_collision(sprite)
+            self.lap("collisions")
+            # Speed multiplier of this minute: 2.5 at the lunch rush, 1.0 in
+            # the first ten minutes of each hour, 0.3 otherwise
+            if speed is not None:
+                for agent in self.zone_members["work"]:
+                    agent.speed = getattr(agent, "base_speed", 2.0) * speed
+            self.update_agents()
+            self.lap("update")
+            for agent in self.all_sprites:
+                self.enforce_zone_boundaries(agent)
+            self.lap("boundaries")
+            self.update_agent_locations()
+            self.lap("locations")
+            self.check_end_of_run()
+            self.lap("logging")
+            self.custom_collision_checks()
+            return
+
+    def skip_to(self, minute):
+        """Move the clock forward to minute; the minutes skipped are sleep, so none is logged."""
+        self.minute = minute
+        self.schedule_row = self.timetable[minute % len(self.timetable)]
+
+    def update_agents(self):
+        """
+        Update every agent once, in all_sprites order like Group.update().
+
+        Agents deflect off the first agent they overlap through one
+        neighbor index instead of each scanning all_sprites. The index is
+        built from the current positions and each agent is refiled right
+        after it moves, so every query sees the positions the scan would.
+        Moved agents are refiled in the zone index the same way.
+        """
+        neighbors = self.neighbors
+        zone_index = self.zone_index
+        neighbors.build(self.all_sprites)
+        for agent in self.all_sprites.sprites():
+            agent.update()
+            neighbors.move(agent)
+            zone_index.locate(agent)
+
+    def transition(self, agent, new_state):
+        """
+        Switch an agent to another state in place.
+
+        The sprite keeps its position, heading, schedule, home cell, valence
+        and skepticism; only its state group, the counters and the
+        state-specific attributes (tint, speed, influence...) change.
+        """
+        _, old_group, old_count = self.state_table[agent.state]
+        new_class, new_group, new_count = self.state_table[new_state]
+        # Agent is not a pygame Sprite, so Group.add/remove would take their
+        # non-sprite fallback; file it through the sprite protocol directly
+        old_group.remove_internal(agent)
+        agent.remove_internal(old_group)
+        new_group.add_internal(agent)
+        agent.add_internal(new_group)
+        setattr(self, old_count, getattr(self, old_count) - 1)
+        setattr(self, new_count, getattr(self, new_count) + 1)
+
+        agent.__class__ = new_class
+        agent.apply_state()
+        agent.update_image()
+        # The agent now sits at the end of its new group, so queries should
+        # rank it after the agents already there
+        self.neighbors.reorder(agent)
+
+    def custom_collision_checks(self):
+        # Broad phase for the contact rules below; agents do not move until
+        # the transitions are done, so one build serves every rule
+        contacts = self.neighbors
+        contacts.build(
+            agent for _, group, _ in self.state_table.values() for agent in group
+        )
+
+        # SUSCEPTIBLE + BELIEVER -> EXPOSED
+        for susceptible in list(self.susceptible_group):
+            believer = contacts.first_overlap(susceptible, self.believer_group)
+            if believer is not None:
+                prob = change_probability(
+                    susceptible,
+                    influencer=believer,
+                    environment_factor=self.get_environment_factor(susceptible),
+                )
+                if self.rng.transitions.random() < prob:
+                    # Susceptible → Exposed
+                    self.transition(susceptible, EXPOSED)
+
+        # SUSCEPTIBLE + DISINFORMANT -> EXPOSED
+        for susceptible in list(self.susceptible_group):
+            disinformant = contacts.first_overlap(susceptible, self.disinformant_group)
+            if disinformant is not None:
+                prob = change_probability(
+                    susceptible,
+                    influencer=disinformant,
+                    environment_factor=self.get_environment_factor(susceptible),
+                    misinformant_exposure=1
+                )
+                if self.rng.transitions.random() < prob:
+                    # Susceptible → Exposed
+                    self.transition(susceptible, EXPOSED)
+
+        # EXPOSED + BELIEVER -> BELIEVER
+        for exposed in list(self.exposed_group):
+            believer = contacts.first_overlap(exposed, self.believer_group)
+            if believer is not None:
+                prob = change_probability(
+                    exposed,
+                    influencer=believer,
+                    environment_factor=self.get_environment_factor(exposed),
+                )
+                if self.rng.transitions.random() < prob:
+                    # Exposed → Believer
+                    self.transition(exposed, BELIEVER)
+
+        # EXPOSED + DOUBTER -> DOUBTER
+        for exposed in list(self.exposed_group):
+            doubter = contacts.first_overlap(exposed, self.doubter_group)
+            if doubter is not None:
+                prob = change_probability(
+                    exposed,
+                    influencer=doubter,
+                    environment_factor=self.get_environment_factor(exposed),
+                )
+                if self.rng.transitions.random() < prob:
+                    # Exposed → Doubter
+                    self.transition(exposed, DOUBTER)
+
+        # EXPOSED + DISINFORMANT -> BELIEVER
+        for exposed in list(self.exposed_group):
+            disinformant = contacts.first_overlap(exposed, self.disinformant_group)
+            if disinformant is not None:
+                prob = change_probability(
+                    exposed,
+                    influencer=disinformant,
+                    environment_factor=self.get_environment_factor(exposed),
+                    misinformant_exposure=1
+                )
+                if self.rng.transitions.random() < prob:
+                    # Exposed → Believer
+                    self.transition(exposed, BELIEVER)
+
+        # BELIEVER + DOUBTER -> BELIEVER → RECOVERED
+        for doubter in list(self.doubter_group):
+            believer = contacts.first_overlap(doubter, self.believer_group)
+            if believer is not None:
+                prob = change_probability(
+                    believer,
+                    influencer=doubter,
+                    environment_factor=self.get_environment_factor(believer),
+                )
+                if self.rng.transitions.random() < prob:
+                    # Believer → Recovered
+                    self.transition(believer, RECOVERED)
+
+        # DOUBTER + DISINFORMANT -> DOUBTER → EXPOSED (rare)
+        for doubter in list(self.doubter_group):
+            disinformant = contacts.first_overlap(doubter, self.disinformant_group)
+            if disinformant is not None:
+                prob = change_probability(
+                    doubter,
+                    influencer=disinformant,
+                    environment_factor=self.get_environment_factor(doubter),
+                    misinformant_exposure=1
+                )
+                if self.rng.transitions.random() < prob:
+                    # Doubter → Exposed
+                    self.transition(doubter, EXPOSED)
+
+        # BELIEVER → SUSCEPTIBLE (forgetting, 20–40 min depending on slider)
+        for agent in list(self.believer_group):
+            expected_minutes = 20 + 20 * self.global_emotional_valence
+            frames = expected_minutes * 60  # 60 fps
+            forget_prob = 1 / frames if frames > 0 else 0
+            if self.rng.transitions.random() < forget_prob:
+                self.transition(agent, SUSCEPTIBLE)
+
+        # EXPOSED → SUSCEPTIBLE (forgetting, 20–40 min depending on slider)
+        for agent in list(self.exposed_group):
+            expected_minutes = 20 + 20 * self.global_emotional_valence
+            frames = expected_minutes * 60  # 60 fps
+            forget_prob = 1 / frames if frames > 0 else 0
+            if self.rng.transitions.random() < forget_prob:
+                self.transition(agent, SUSCEPTIBLE)
+
+        self.total_misinformed = self.believer_count + self.exposed_count
+        self.lap("transitions")
+
+        # --- Social media specific logic ---
+        if self.phase == "social":
+            # Agents in social media: move freely
+            # Agents in home: restrict to grid cell
+            for agent in self.all_sprites:
+                if hasattr(agent, "in_social") and not agent.in_social:
+                    # Restrict to grid cell
+                    self.enforce_home_grid_boundaries(agent)
+            self.lap("boundaries")
+            # Only check collisions within each grid cell for home agents
+            for cell, agents in self.home_grid_agents.items():
+                for i, agent in enumerate(agents):
+                    for other in agents[i+1:]:
+                        if pygame.sprite.collide_rect(agent, other):
+                            agent.handle_collision(other)
+                            other.handle_collision(agent)
+            self.lap("collisions")
+            # Social agents move/collide as normal (handled by update_agents())
+            self.update_agents()
+            self.lap("update")
+            for agent in self.all_sprites:
+                if hasattr(agent, "in_social") and not agent.in_social:
+                    self.enforce_home_grid_boundaries(agent)
+            self.lap("boundaries")
+
+        # --- Stop simulation if time is up ---
+        self.check_end_of_run()
+
+        # Log every 10 minutes (the log tick is a queued event)
+        if self.log_due:
+            self.log_current_state()
+            self.log_due = False
+        self.lap("logging")
+
+    def close(self):
+        """Write out any buffered log rows, close the log and write the profile."""
+        if getattr(self, 'logger', None) is not None:
+            self.logger.close()
+        if getattr(self, 'profiler', None) is not None and not self.profile_written:
+            self.profiler.write(self.profile_path)
+            self.profile_written = True
+
+    def __del__(self):
+        """Cleanup method to close log file"""
+        self.close()
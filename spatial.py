@@ -0,0 +1,162 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """
+    Uniform-grid broad phase over sprite rects.
+
+    Every sprite is filed under each grid cell its rect touches, so an
+    overlap query only looks at sprites in the cells around the query
+    rect instead of the whole population. Sprites remember the order they
+    were inserted in, which lets queries return the same "first" hit a
+    plain loop over a Group would find. A sprite that moves after the
+    build is refiled with move(), so one build can serve a whole pass of
+    moving sprites.
+    """
+
+    def __init__(self, cell_size=80):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.order = {}
+        self.spans = {}  # sprite -> cell range it was last filed under
+        self.next_order = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+        self.spans.clear()
+        self.next_order = 0
+
+    def build(self, sprites):
+        """Rebuild the grid from scratch from an iterable of sprites."""
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size + 1, rect.top // size, (rect.bottom - 1) // size + 1)
+
+    def _cell_keys(self, rect):
+        x0, x1, y0, y1 = self._span(rect)
+        for cx in range(x0, x1):
+            for cy in range(y0, y1):
+                yield (cx, cy)
+
+    def insert(self, sprite):
+        """Add a sprite at its current rect, after everything already inserted."""
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+        span = self._span(sprite.rect)
+        self.spans[sprite] = span
+        x0, x1, y0, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1):
+            for cy in range(y0, y1):
+                cells[(cx, cy)].append(sprite)
+
+    def move(self, sprite):
+        """
+        File an inserted sprite under the cells of its current rect,
+        keeping its place in the query order. Entries in cells it has left
+        stay until the next build; queries test the real rects, so they
+        only cost a little extra checking.
+        """
+        span = self._span(sprite.rect)
+        old = self.spans[sprite]
+        if span == old:
+            return
+        self.spans[sprite] = span
+        x0, x1, y0, y1 = span
+        ox0, ox1, oy0, oy1 = old
+        cells = self.cells
+        for cx in range(x0, x1):
+            for cy in range(y0, y1):
+                if not (ox0 <= cx < ox1 and oy0 <= cy < oy1):
+                    cells[(cx, cy)].append(sprite)
+
+    def reorder(self, sprite):
+        """Move a sprite to the back of the query order without refiling it."""
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+
+    def candidates(self, rect):
+        """Return the set of sprites filed in any cell that rect touches."""
+        cells = self.cells
+        found = set()
+        for key in self._cell_keys(rect):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def first_overlap(self, sprite, group=None, ratio=None):
+        """
+        Return the earliest-inserted sprite other than sprite, and a member
+        of group if one is given, whose rect overlaps sprite's rect, or
+        None.
+
+        Overlap is pygame.sprite.collide_rect or, with a ratio (at most 1),
+        collide_rect_ratio(ratio), so this finds the first hit of
+        spritecollide over the Group the index was built from.
+        """
+        rect = sprite.rect
+        if ratio is not None:
+            rect = scaled_rect(rect, ratio)
+        order = self.order
+        best = None
+        best_order = None
+        for other in self.candidates(sprite.rect):
+            if other is sprite or (group is not None and not group.has_internal(other)):
+                continue
+            other_rect = other.rect if ratio is None else scaled_rect(other.rect, ratio)
+            if not rect.colliderect(other_rect):
+                continue
+            other_order = order[other]
+            if best is None or other_order < best_order:
+                best = other
+                best_order = other_order
+        return best
+
+
+def scaled_rect(rect, ratio):
+    """Return rect scaled about its centre, exactly as pygame.sprite.collide_rect_ratio does."""
+    width = rect.width
+    height = rect.height
+    return rect.inflate(width * ratio - width, height * ratio - height)
+
+
+def sweep_and_prune(sprites, ratio=0.8):
+    """
+    Return every unordered pair of overlapping sprites exactly once.
+
+    Two sprites overlap when pygame.sprite.collide_rect_ratio(ratio) says
+    they do. Rects are scaled once per sprite, sorted by their left edge
+    and swept along x, so only pairs whose x-intervals overlap reach the
+    y test. Pairs come back as (a, b) with a before b in the input order,
+    sorted by that order, which is the order groupcollide first met them.
+    """
+    sprites = list(sprites)
+    boxes = []
+    for index, sprite in enumerate(sprites):
+        rect = scaled_rect(sprite.rect, ratio)
+        boxes.append((rect.left, rect.right, rect.top, rect.bottom, index))
+    boxes.sort()
+
+    pairs = []
+    active = []
+    for box in boxes:
+        left, right, top, bottom, index = box
+        # Drop boxes that end before this one starts; they can't hit anything later
+        active = [other for other in active if other[1] > left]
+        for other in active:
+            if other[2] < bottom and top < other[3]:
+                other_index = other[4]
+                if other_index < index:
+                    pairs.append((other_index, index))
+                else:
+                    pairs.append((index, other_index))
+        active.append(box)
+
+    pairs.sort()
+    return [(sprites[i], sprites[j]) for i, j in pairs]
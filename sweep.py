@@ -0,0 +1,128 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulation import Simulation
+
+# Columns of the sweep manifest, one row per run
+MANIFEST_COLUMNS = (
+    'Run_ID',
+    'Path',
+    'Susceptible',
+    'Doubter',
+    'Disinformant',
+    'Emotional Valence',
+    'Days',
+    'Seed',
+    'Status',
+    'Seconds'
+)
+
+
+def sweep_grid(susceptible=(20,), doubter=(5,), disinformant=(3,), emotional_valence=(5,),
+               days=(1,), seeds=(0,)):
+    """
+    Return one run spec per combination of the given values.
+
+    Emotional valence uses the 0-10 slider scale. Every combination is run
+    once per seed, so seeds doubles as the list of replicates.
+    """
+    specs = []
+    for index, (s, d, m, e, n, seed) in enumerate(
+            itertools.product(susceptible, doubter, disinformant, emotional_valence, days, seeds), 1):
+        specs.append({
+            "run_id": f"run_{index:04d}",
+            "counts": {"Susceptible": s, "Doubter": d, "Disinformant": m, "Emotional Valence": e},
+            "days": n,
+            "seed": seed,
+        })
+    return specs
+
+
+def run_one(spec, out_dir, log_format='csv', profile=False):
+    """Run a single spec headlessly in this process and return its manifest row."""
+    path = os.path.join(out_dir, f"{spec['run_id']}.{log_format}")
+    profile_path = os.path.join(out_dir, f"{spec['run_id']}_profile.json") if profile else None
+    started = time.perf_counter()
+    sim = Simulation(log_path=path, run_id=spec["run_id"], log_format=log_format, seed=spec["seed"],
+                     profile_path=profile_path)
+    try:
+        sim.run(spec["counts"], sim_days=spec["days"])
+    finally:
+        sim.close()
+    return manifest_row(spec, path, "ok", time.perf_counter() - started)
+
+
+def manifest_row(spec, path, status, seconds):
+    counts = spec["counts"]
+    return [
+        spec["run_id"],
+        path,
+        counts["Susceptible"],
+        counts["Doubter"],
+        counts["Disinformant"],
+        counts["Emotional Valence"],
+        spec["days"],
+        spec["seed"],
+        status,
+        f"{seconds:.2f}"
+    ]
+
+
+def run_sweep(specs, out_dir, workers=None, log_format='csv', profile=False):
+    """
+    Run every spec across a pool of worker processes.
+
+    Each run writes its own log into out_dir and a manifest.csv there lists
+    the parameters, path and outcome of every run; with profile each run
+    also writes <run_id>_profile.json. A run that raises is
+    recorded as failed instead of stopping the sweep. Returns the manifest
+    rows in spec order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_one, spec, out_dir, log_format, profile): spec for spec in specs}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                row = manifest_row(spec, "", f"failed: {e}", 0.0)
+            rows[spec["run_id"]] = row
+            print(f"{row[0]}: {row[8]} ({row[9]} s)")
+
+    ordered = [rows[spec["run_id"]] for spec in specs]
+    with open(os.path.join(out_dir, 'manifest.csv'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(MANIFEST_COLUMNS)
+        writer.writerows(ordered)
+    return ordered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a grid of headless simulations in parallel.")
+    parser.add_argument('--susceptible', type=int, nargs='+', default=[20])
+    parser.add_argument('--doubter', type=int, nargs='+', default=[5])
+    parser.add_argument('--disinformant', type=int, nargs='+', default=[3])
+    parser.add_argument('--valence', type=int, nargs='+', default=[5], help="Emotional valence, 0-10")
+    parser.add_argument('--days', type=int, nargs='+', default=[1])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0], help="One replicate per seed")
+    parser.add_argument('--out', default='runs', help="Directory for the run logs and manifest.csv")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--format', default='csv', choices=['csv', 'npz', 'parquet', 'feather'])
+    parser.add_argument('--profile', action='store_true', help="Write a per-section timing report per run")
+    args = parser.parse_args(argv)
+
+    specs = sweep_grid(args.susceptible, args.doubter, args.disinformant, args.valence,
+                       args.days, args.seeds)
+    rows = run_sweep(specs, args.out, workers=args.workers, log_format=args.format, profile=args.profile)
+    failed = sum(1 for row in rows if row[8] != "ok")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
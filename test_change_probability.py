@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from population import SUSCEPTIBLE, EXPOSED, BELIEVER, DOUBTER, RECOVERED, DISINFORMANT
+from simulation import change_probability, change_probability_batch
+
+beta = pytest.importorskip("scipy.stats").beta
+
+
+def reference_probability(valence, skepticism, influence, environment_factor, misinformant_exposure,
+                          agent_state, influencer_state):
+    """change_probability as it was written against scipy.stats.beta, for one contact."""
+    prob = influence * beta.cdf(valence, 2, 2) * (1.0 - skepticism) * environment_factor
+    prob += min(0.05 * misinformant_exposure, 0.25)
+    if agent_state == DOUBTER and influencer_state in (BELIEVER, DISINFORMANT):
+        prob *= 0.05
+    return max(0.0, min(1.0, prob))
+
+
+@pytest.fixture
+def contacts():
+    """Random contacts, with valences outside [0, 1] and every state pairing."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    states = np.array([SUSCEPTIBLE, EXPOSED, BELIEVER, DOUBTER, RECOVERED, DISINFORMANT])
+    return {
+        "valence": np.concatenate([rng.uniform(-0.5, 1.5, n - 4), [-1.0, 0.0, 1.0, 2.0]]),
+        "skepticism": rng.uniform(0, 1, n),
+        "influence": rng.uniform(0.4, 3.0, n),
+        "environment_factor": rng.choice([0.5, 0.7, 1.0], n),
+        "misinformant_exposure": rng.integers(0, 8, n),
+        "agent_state": rng.choice(states, n),
+        "influencer_state": rng.choice(states, n),
+    }
+
+
+def expected(contacts):
+    return np.array([reference_probability(*values) for values in zip(*contacts.values())])
+
+
+def test_scalar_matches_scipy(contacts):
+    actual = []
+    for valence, skepticism, influence, env, exposure, agent_state, influencer_state in zip(*contacts.values()):
+        agent = SimpleNamespace(emotional_valence=valence, skepticism=skepticism, state=agent_state)
+        influencer = SimpleNamespace(influence=influence, state=influencer_state)
+        actual.append(change_probability(agent, influencer=influencer, environment_factor=env,
+                                         misinformant_exposure=exposure))
+    np.testing.assert_allclose(actual, expected(contacts), rtol=1e-12, atol=1e-12)
+
+
+def test_batch_matches_scipy(contacts):
+    actual = change_probability_batch(*contacts.values())
+    np.testing.assert_allclose(actual, expected(contacts), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("influencer_state", [BELIEVER, DISINFORMANT])
+def test_doubters_rarely_convert(influencer_state):
+    valence, skepticism, influence, env = 0.6, 0.3, 2.0, 0.7
+    unscaled = influence * beta.cdf(valence, 2, 2) * (1.0 - skepticism) * env
+    agent = SimpleNamespace(emotional_valence=valence, skepticism=skepticism, state=DOUBTER)
+    influencer = SimpleNamespace(influence=influence, state=influencer_state)
+
+    assert change_probability(agent, influencer=influencer, environment_factor=env) == pytest.approx(0.05 * unscaled)
+    batch = change_probability_batch(valence, skepticism, influence, env, 0, DOUBTER, influencer_state)
+    assert batch == pytest.approx(0.05 * unscaled)
+    # Other influencers are not scaled down
+    batch = change_probability_batch(valence, skepticism, influence, env, 0, DOUBTER, SUSCEPTIBLE)
+    assert batch == pytest.approx(unscaled)
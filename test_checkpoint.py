@@ -0,0 +1,48 @@
+import gzip
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pygame")
+
+from simulation import Simulation
+
+COUNTS = {"Susceptible": 12, "Doubter": 3, "Disinformant": 2, "Emotional Valence": 5}
+
+
+@pytest.fixture(autouse=True)
+def in_repo(monkeypatch):
+    # The agent frames are loaded from Images/ relative to the working directory
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+
+def checkpoints(tmp_path, fast_forward):
+    """Run three seeded days with a daily checkpoint and return {file name: state}."""
+    out = tmp_path / ("fast" if fast_forward else "slow")
+    out.mkdir()
+    sim = Simulation(log_path=str(out / "log.csv"), seed=4,
+                     checkpoint_path=str(out / "ck_{time}.json.gz"), checkpoint_every=1440)
+    sim.fast_forward = fast_forward
+    sim.run(COUNTS, sim_days=3)
+
+    states = {}
+    for path in sorted(out.glob("ck_*.json.gz")):
+        with gzip.open(path, "rt") as f:
+            state = json.load(f)
+        # Everything but the run's own directory and fast-forward switch
+        del state["settings"]["log_path"]
+        del state["clock"]["fast_forward"]
+        states[path.name] = state
+    return states
+
+
+def test_fast_forward_writes_the_same_checkpoints(tmp_path):
+    fast = checkpoints(tmp_path, fast_forward=True)
+    slow = checkpoints(tmp_path, fast_forward=False)
+
+    # One per simulated day, at the minute each one falls due
+    assert list(fast) == ["ck_20230102-0600.json.gz", "ck_20230103-0600.json.gz", "ck_20230104-0600.json.gz"]
+    assert list(slow) == list(fast)
+    for name in fast:
+        assert fast[name] == slow[name], name
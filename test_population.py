@@ -0,0 +1,102 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from population import STATE_CODES, Population
+from simulation import Simulation
+
+COUNTS = {"Susceptible": 8, "Exposed": 4, "Believer": 4, "Doubter": 4, "Recovered": 4, "Disinformant": 4}
+
+
+class NoTurnsGenerator:
+    """NumPy generator whose random() never falls under a turn probability."""
+
+    def __init__(self, seed):
+        self.generator = np.random.default_rng(seed)
+
+    def random(self, size=None):
+        return np.full(size, 0.99)
+
+    def __getattr__(self, name):
+        return getattr(self.generator, name)
+
+
+class NoTurnsRandom(random.Random):
+    """The sprites' counterpart of NoTurnsGenerator."""
+
+    def random(self):
+        return 0.99
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    # The agent frames are loaded from Images/ relative to the working directory
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    return Simulation(log_path=os.devnull, seed=0)
+
+
+def sprites_like(sim, population):
+    """One sprite per row of population, with the same state, position, heading and speed."""
+    classes = {code: agent_class for code, (agent_class, _, _) in sim.state_table.items()}
+    sprites = []
+    for row in range(population.size):
+        agent = classes[population.state[row]](None, pygame.sprite.Group(), rng=NoTurnsRandom(0))
+        agent.rect.center = tuple(int(v) for v in population.position[row])
+        agent.direction_vector = pygame.math.Vector2(*population.velocity[row])
+        agent.speed = int(population.speed[row])
+        sprites.append(agent)
+    return sprites
+
+
+def assert_same_positions(population, sprites):
+    np.testing.assert_array_equal(population.position[:population.size],
+                                  [agent.rect.center for agent in sprites])
+
+
+def test_spawn_matches_initial_factors(sim):
+    population = Population.from_counts(COUNTS, sim.zones["home"], rng=np.random.default_rng(0))
+
+    assert population.size == sum(COUNTS.values())
+    assert list(population.counts()) == [COUNTS[name] for name in STATE_CODES]
+    home = sim.zones["home"]
+    x, y = population.position[:population.size].T
+    assert ((x >= home.left) & (x <= home.right) & (y >= home.top) & (y <= home.bottom)).all()
+    skepticism = population.skepticism[population.state == STATE_CODES["Recovered"]]
+    assert ((skepticism >= 0.2) & (skepticism <= 0.8)).all()
+
+
+def test_tick_moves_like_the_sprites(sim):
+    population = Population.from_counts(COUNTS, sim.zones["home"], rng=NoTurnsGenerator(0))
+    sprites = sprites_like(sim, population)
+
+    # Long enough for the fast agents to reach the screen edges
+    for _ in range(120):
+        population.tick()
+        for agent in sprites:
+            agent.update()
+        assert_same_positions(population, sprites)
+        np.testing.assert_array_equal(population.velocity[:population.size],
+                                      [tuple(agent.direction_vector) for agent in sprites])
+
+
+def test_clamp_matches_work_hour_boundaries(sim):
+    work = sim.zones["work"]
+    population = Population.from_counts(COUNTS, work, rng=NoTurnsGenerator(0))
+    sprites = sprites_like(sim, population)
+    for agent in sprites:
+        sim.zone_index.place(agent, "work")
+
+    for _ in range(40):
+        population.tick(list(sim.zones.values()))
+        for agent in sprites:
+            agent.update()
+            sim.zone_index.locate(agent)
+            sim.enforce_zone_boundaries(agent)
+        # Headings off a wall are random on both sides; positions must agree
+        assert_same_positions(population, sprites)
+        for row, agent in enumerate(sprites):
+            agent.direction_vector = pygame.math.Vector2(*population.velocity[row])
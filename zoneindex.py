@@ -0,0 +1,60 @@
+class ZoneIndex:
+    """
+    Zone membership of every agent.
+
+    Each agent carries the name of the zone its centre is in (agent.zone,
+    None between zones) and members maps every zone to its agents, in the
+    order they entered it. Placing an agent sets its zone directly;
+    agents that moved on their own are refiled with locate(), which only
+    tests the agent's own zone unless it has left it. Everything else
+    reads agent.zone instead of testing points against every zone rect.
+    Agents that locate() found in another zone are also collected in
+    refiled, until the caller clears it.
+    """
+
+    def __init__(self, zones):
+        self.zones = zones  # name -> pygame.Rect, first match wins like the zone loops did
+        self.members = {name: {} for name in zones}  # name -> {agent: None}, insertion ordered
+        self.refiled = {}  # Agents that changed zone by moving, {agent: None}
+
+    def clear(self):
+        for members in self.members.values():
+            members.clear()
+        self.refiled.clear()
+
+    def place(self, agent, name):
+        """File agent under zone name (or None), leaving its previous zone."""
+        old = agent.zone
+        if old == name:
+            return
+        if old is not None:
+            self.members[old].pop(agent, None)
+        agent.zone = name
+        if name is not None:
+            self.members[name][agent] = None
+
+    def remove(self, agent):
+        self.place(agent, None)
+
+    def zone_at(self, pos):
+        """Return the name of the zone containing pos, or None."""
+        for name, rect in self.zones.items():
+            if rect.collidepoint(pos):
+                return name
+        return None
+
+    def locate(self, agent):
+        """Refile agent after it moved by itself and return its zone name."""
+        name = agent.zone
+        if name is not None and self.zones[name].collidepoint(agent.rect.center):
+            return name
+        name = self.zone_at(agent.rect.center)
+        if name != agent.zone:
+            self.place(agent, name)
+            self.refiled[agent] = None
+        return name
+
+    def rect(self, agent):
+        """Return the rect of agent's zone, or None."""
+        name = agent.zone
+        return self.zones[name] if name is not None else None